@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from ..cache import calculation_cache
+from ..metrics import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/cache/stats")
+def cache_stats():
+    return {"success": True, "data": calculation_cache.stats()}
@@ -0,0 +1,69 @@
+from typing import Any, List, Literal, Optional
+
+import numpy as np
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from ..climate_zones import ClimateZoneGeoJSON, ClimateZoneIndex
+from ..dependencies import climate_zone_geojson, climate_zone_index, validate_batch
+from ..models import LocationModel
+from ..metrics import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/climate-zone")
+def climate_zone(lat: float, lon: float, index: ClimateZoneIndex = Depends(climate_zone_index)):
+    climate = index.lookup([lat], [lon])[0]
+    if climate is None:
+        raise HTTPException(status_code=404, detail="No climate zone found for this location")
+    return {"success": True, "climate": climate}
+
+@router.post("/climate-zone/batch")
+def climate_zone_batch(items: List[Any] = Body(...), index: ClimateZoneIndex = Depends(climate_zone_index)):
+    """
+    Look up the climate zone for an array of locations in one request.
+    Locations outside every zone get a null climate.
+    """
+    indices, models, errors = validate_batch(LocationModel, items)
+    climates = index.lookup(
+        np.fromiter((m.lat for m in models), dtype=np.float64, count=len(models)),
+        np.fromiter((m.lon for m in models), dtype=np.float64, count=len(models)),
+    )
+    results = [None] * len(items)
+    for i, item_errors in errors.items():
+        results[i] = {"success": False, "errors": item_errors}
+    for i, climate in zip(indices, climates.tolist()):
+        results[i] = {"success": True, "climate": climate}
+    return {"success": not errors, "results": results}
+
+def detail_for_zoom(zoom: int) -> str:
+    """Map a web map zoom level to a boundaries detail level."""
+    if zoom <= 5:
+        return "low"
+    if zoom <= 8:
+        return "medium"
+    if zoom <= 11:
+        return "high"
+    return "full"
+
+@router.get("/climate-zone/boundaries")
+def climate_zone_boundaries(
+    detail: Literal["low", "medium", "high", "full"] = "medium",
+    zoom: Optional[int] = Query(None, ge=0, description="Web map zoom level; overrides detail"),
+    accept_encoding: str = Header(""),
+    if_none_match: Optional[str] = Header(None),
+    boundaries: ClimateZoneGeoJSON = Depends(climate_zone_geojson),
+):
+    """
+    Climate zone boundaries as GeoJSON at the requested level of simplification.
+    Responses are pre-compressed and carry a strong ETag; a matching If-None-Match gets a 304.
+    """
+    if zoom is not None:
+        detail = detail_for_zoom(zoom)
+    etag, encoding, body = boundaries.get(detail, accept_encoding)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "public, max-age=86400"}
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/geo+json", headers=headers)
@@ -1,10 +1,38 @@
+from typing import Any, List
+
+import numpy as np
 from fastapi import APIRouter, Body
 from ..models import SpaceHeatingModel
-from ..calculations import calculate_heating
+from ..calculations import calculate_heating, calculate_heating_batch
+from ..dependencies import validate_batch
+from ..fast_json import FastJSONRoute, json_response
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/space-heating/")
 def space_heating(data: SpaceHeatingModel):
     result = calculate_heating(data)
-    return {"success": True, "data": result}
+    return json_response({"success": True, "data": result})
+
+def space_heating_results(items):
+    """
+    Per-item space heating results for a list of raw households, computed as one
+    NumPy batch. Invalid items get their validation errors in place of a result.
+    """
+    indices, models, errors = validate_batch(SpaceHeatingModel, items)
+    results = [None] * len(items)
+    for i, item_errors in errors.items():
+        results[i] = {"success": False, "errors": item_errors}
+    batch = calculate_heating_batch(np.fromiter((m.area for m in models), dtype=np.float64, count=len(models)))
+    for i, cost in zip(indices, batch["cost"].tolist()):
+        results[i] = {"success": True, "data": {"cost": cost}}
+    return results
+
+@router.post("/space-heating/batch")
+def space_heating_batch(items: List[Any] = Body(...)):
+    """
+    Calculate space heating for an array of households in one request.
+    Each item is validated independently; invalid items are reported in place.
+    """
+    results = space_heating_results(items)
+    return json_response({"success": all(r["success"] for r in results), "results": results})
@@ -0,0 +1,126 @@
+import csv
+import json
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from ..metrics import TimedRoute
+from .heating import space_heating_results
+from .water_heating import water_heating_results
+
+router = APIRouter(route_class=TimedRoute)
+
+MAX_CHUNK_SIZE = 10000
+
+STREAM_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/x-ndjson": {"schema": {"type": "string", "description": "One household JSON object per line"}},
+            "text/csv": {"schema": {"type": "string", "description": "A header row of field names, then one household per row"}},
+        },
+    },
+    "responses": {"200": {"content": {"application/x-ndjson": {}}, "description": "One result per input line, in order"}},
+}
+
+
+class ParseError:
+    """Stands in for a record that could not be parsed, so it still gets a result line."""
+
+    def __init__(self, msg):
+        self.msg = msg
+
+
+async def _lines(request):
+    """Yield complete lines from the request body as the bytes arrive."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def _ndjson_records(lines):
+    async for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ParseError(f"Invalid JSON: {e}")
+
+
+async def _csv_records(lines):
+    header = None
+    async for line in lines:
+        if not line.strip():
+            continue
+        text = line.decode("utf-8-sig" if header is None else "utf-8", errors="replace").rstrip("\r")
+        row = next(csv.reader([text]))
+        if header is None:
+            header = row
+        elif len(row) != len(header):
+            yield ParseError(f"Expected {len(header)} fields, got {len(row)}")
+        else:
+            yield dict(zip(header, row))
+
+
+def _chunk_results(compute, records):
+    """Results for one chunk of records, with parse errors kept in place."""
+    parsed = [(i, record) for i, record in enumerate(records) if not isinstance(record, ParseError)]
+    computed = compute([record for _, record in parsed])
+    results = [
+        {"success": False, "errors": [{"type": "parse_error", "loc": [], "msg": record.msg}]}
+        if isinstance(record, ParseError) else None
+        for record in records
+    ]
+    for (i, _), result in zip(parsed, computed):
+        results[i] = result
+    return results
+
+
+async def _stream_results(request, compute, chunk_size):
+    """
+    Read households from the request body and yield NDJSON results a chunk at a
+    time, so memory is bounded by the chunk size and output starts before the
+    upload has finished.
+    """
+    content_type = request.headers.get("content-type", "")
+    records = _csv_records(_lines(request)) if content_type.startswith("text/csv") else _ndjson_records(_lines(request))
+    index = 0
+    chunk = []
+
+    async def flush():
+        nonlocal index
+        results = await run_in_threadpool(_chunk_results, compute, chunk)
+        lines = "".join(json.dumps({"index": index + i, **result}) + "\n" for i, result in enumerate(results))
+        index += len(results)
+        chunk.clear()
+        return lines
+
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield await flush()
+    if chunk:
+        yield await flush()
+
+
+@router.post("/space-heating/stream", openapi_extra=STREAM_OPENAPI)
+async def space_heating_stream(request: Request, chunk_size: int = Query(1000, ge=1, le=MAX_CHUNK_SIZE)):
+    """
+    Calculate space heating for a streamed NDJSON or CSV upload of households,
+    streaming NDJSON results back as each chunk is processed.
+    """
+    return StreamingResponse(_stream_results(request, space_heating_results, chunk_size), media_type="application/x-ndjson")
+
+
+@router.post("/water-heating/stream", openapi_extra=STREAM_OPENAPI)
+async def water_heating_stream(request: Request, chunk_size: int = Query(1000, ge=1, le=MAX_CHUNK_SIZE)):
+    """
+    Calculate water heating energy for a streamed NDJSON or CSV upload of households,
+    streaming NDJSON results back as each chunk is processed.
+    """
+    return StreamingResponse(_stream_results(request, water_heating_results, chunk_size), media_type="application/x-ndjson")
@@ -1,18 +1,53 @@
-from fastapi import APIRouter, HTTPException
+from typing import Any, List
+
+import numpy as np
+from fastapi import APIRouter, Body, HTTPException
 from ..models import WaterHeatingModel
+from .. import calculations
+from ..calculations import calculate_water_heating_batch
+from ..dependencies import validate_batch
+from ..fast_json import FastJSONRoute, json_response
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/water-heating/")
 def calculate_water_heating(data: WaterHeatingModel):
     try:
         result = perform_water_heating_calculation(data)
-        return {"success": True, "energy_kwh": result}
+        return json_response({"success": True, "energy_kwh": result})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+def water_heating_results(items):
+    """
+    Per-item water heating results for a list of raw households, computed as one
+    NumPy batch. Invalid items, including zero efficiency, get errors in place of a result.
+    """
+    indices, models, errors = validate_batch(WaterHeatingModel, items)
+    columns = {
+        field: np.fromiter((getattr(m, field) for m in models), dtype=np.float64, count=len(models))
+        for field in ("volume_litres", "temp_increase_celsius", "efficiency")
+    }
+    batch = calculate_water_heating_batch(**columns)
+    results = [None] * len(items)
+    for i, item_errors in errors.items():
+        results[i] = {"success": False, "errors": item_errors}
+    for i, efficiency, energy in zip(indices, columns["efficiency"].tolist(), batch["energy_required"].tolist()):
+        if efficiency == 0:
+            results[i] = {"success": False, "errors": [{"type": "value_error", "loc": ["efficiency"], "msg": "float division by zero"}]}
+        else:
+            results[i] = {"success": True, "energy_kwh": energy}
+    return results
+
+@router.post("/water-heating/batch")
+def water_heating_batch(items: List[Any] = Body(...)):
+    """
+    Calculate water heating energy for an array of households in one request.
+    Each item is validated independently; invalid items are reported in place.
+    """
+    results = water_heating_results(items)
+    return json_response({"success": all(r["success"] for r in results), "results": results})
+
 def perform_water_heating_calculation(data: WaterHeatingModel):
-    # Calculate the energy required for heating the water
-    # Formula: energy (kWh) = volume (liters) * temp increase (C) * 0.001163 (kWh per liter per degree C)
-    energy_required = data.volume_litres * data.temp_increase_celsius * 0.001163 / data.efficiency
-    return energy_required
+    # Goes through the shared calculation so repeated payloads are served from the result cache
+    return calculations.calculate_water_heating(data)["energy_required"]
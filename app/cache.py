@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+
+class ResultCache:
+    """
+    Thread-safe in-process cache with LRU eviction and a time-to-live.
+
+    A maxsize of 0 disables caching. Cached values are shared between callers and
+    should be treated as immutable.
+    """
+
+    def __init__(self, maxsize=4096, ttl=3600.0, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def cached(cache):
+    """
+    Memoise a function of a single pydantic model in the given cache. The key is the
+    model's canonical JSON form, so payloads that validate to the same model share
+    an entry regardless of field order or number formatting.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(data):
+            key = (func.__qualname__, type(data).__name__, data.model_dump_json())
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = func(data)
+            cache.set(key, value)
+            return value
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+calculation_cache = ResultCache(
+    maxsize=int(os.environ.get("CALCULATION_CACHE_SIZE", 4096)),
+    ttl=float(os.environ.get("CALCULATION_CACHE_TTL", 3600)),
+)
@@ -1,11 +1,132 @@
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from .cache import cached, calculation_cache
 from .models import SpaceHeatingModel, WaterHeatingModel
 
-def calculate_heating(data: SpaceHeatingModel):
+
+def heating_cost(area):
     # Implement calculation logic here
-    return {"cost": data.area * 5}  # Dummy example
+    return area * 5  # Dummy example
 
-def calculate_water_heating(data: WaterHeatingModel):
+def water_heating_energy(volume_litres, temp_increase_celsius, efficiency):
     # Calculate the energy required for heating the water
     # Formula: energy (kWh) = volume (litres) * temp increase (C) * 0.001163 (kWh per litre per degree C)
-    energy_required = data.volume_litres * data.temp_increase_celsius * 0.001163 / data.efficiency
+    return volume_litres * temp_increase_celsius * 0.001163 / efficiency
+
+@cached(calculation_cache)
+def calculate_heating(data: SpaceHeatingModel):
+    return {"cost": heating_cost(data.area)}
+
+@cached(calculation_cache)
+def calculate_water_heating(data: WaterHeatingModel):
+    energy_required = water_heating_energy(data.volume_litres, data.temp_increase_celsius, data.efficiency)
+    return {"energy_required": energy_required}
+
+def calculate_heating_batch(area):
+    """Vectorised calculate_heating over an array of floor areas."""
+    return {"cost": heating_cost(np.asarray(area, dtype=np.float64))}
+
+def calculate_water_heating_batch(volume_litres, temp_increase_celsius, efficiency):
+    """
+    Vectorised calculate_water_heating over arrays of model fields.
+    Rows with zero efficiency come back as non-finite values rather than raising.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        energy_required = water_heating_energy(
+            np.asarray(volume_litres, dtype=np.float64),
+            np.asarray(temp_increase_celsius, dtype=np.float64),
+            np.asarray(efficiency, dtype=np.float64),
+        )
     return {"energy_required": energy_required}
+
+_float_adapter = TypeAdapter(float)
+
+def _float_column(values):
+    """Coerce a column to float64 the way pydantic would, returning (values, valid mask)."""
+    array = np.asarray(values)
+    if array.dtype.kind in "biuf":
+        return array.astype(np.float64), np.ones(len(array), dtype=bool)
+    array = array.astype(object)
+    result = np.full(len(array), np.nan)
+    valid = ~np.equal(array, None)
+    try:
+        result[valid] = array[valid].astype(np.float64)
+    except (TypeError, ValueError):
+        # Slow path for dirty columns: find the offending rows one by one
+        for i in np.flatnonzero(valid):
+            try:
+                result[i] = _float_adapter.validate_python(array[i])
+            except ValidationError:
+                valid[i] = False
+    return result, valid
+
+def _str_column(values):
+    """Check a column holds strings, returning (values, valid mask)."""
+    array = np.asarray(values)
+    if array.dtype.kind == "U":
+        return array, np.ones(len(array), dtype=bool)
+    valid = np.fromiter((isinstance(v, str) for v in array.tolist()), dtype=bool, count=len(array))
+    return array, valid
+
+_column_validators = {float: _float_column, str: _str_column}
+
+def validate_columns(model, data, errors="raise"):
+    """
+    Validate the columns of a DataFrame or dict of arrays against the fields of a
+    pydantic model, column by column rather than row by row.
+
+    Returns a dict of validated column arrays and a boolean mask of valid rows.
+    With errors="raise" any invalid row raises a ValueError; with errors="coerce"
+    invalid rows are left in place and flagged in the mask.
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError("errors must be 'raise' or 'coerce'")
+    missing = [name for name in model.model_fields if name not in data]
+    if missing:
+        raise ValueError(f"Missing columns for {model.__name__}: {missing}")
+    columns = {}
+    mask = None
+    for name, field in model.model_fields.items():
+        columns[name], valid = _column_validators[field.annotation](data[name])
+        if errors == "raise" and not valid.all():
+            rows = np.flatnonzero(~valid)[:10].tolist()
+            raise ValueError(f"Invalid values in column '{name}' at rows {rows}")
+        mask = valid if mask is None else mask & valid
+    return columns, mask
+
+def _as_frame(data, result):
+    """Return result columns as a DataFrame if the input was one, else as a dict of arrays."""
+    if hasattr(data, "columns") and hasattr(data, "index"):
+        import pandas as pd
+        return pd.DataFrame(result, index=data.index)
+    return result
+
+def calculate_heating_frame(data, errors="raise"):
+    """
+    Columnar calculate_heating over a pandas DataFrame or dict of arrays with the
+    SpaceHeatingModel fields as columns. Invalid rows give NaN when errors="coerce".
+    """
+    columns, valid = validate_columns(SpaceHeatingModel, data, errors)
+    result = calculate_heating_batch(np.where(valid, columns["area"], np.nan))
+    if errors == "coerce":
+        result["valid"] = valid
+    return _as_frame(data, result)
+
+def calculate_water_heating_frame(data, errors="raise"):
+    """
+    Columnar calculate_water_heating over a pandas DataFrame or dict of arrays with
+    the WaterHeatingModel fields as columns. Invalid rows, including zero
+    efficiency, give NaN when errors="coerce".
+    """
+    columns, valid = validate_columns(WaterHeatingModel, data, errors)
+    zero_efficiency = columns["efficiency"] == 0
+    if errors == "raise" and zero_efficiency.any():
+        raise ZeroDivisionError(f"Zero efficiency at rows {np.flatnonzero(zero_efficiency)[:10].tolist()}")
+    valid &= ~zero_efficiency
+    result = calculate_water_heating_batch(
+        *(np.where(valid, columns[name], np.nan) for name in ("volume_litres", "temp_increase_celsius", "efficiency"))
+    )
+    if errors == "coerce":
+        result["valid"] = valid
+    return _as_frame(data, result)
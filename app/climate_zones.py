@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Built by data-analysis/climate-zone-boundaries/climate_zone_boundaries.py
+DEFAULT_BOUNDARIES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data-analysis", "climate-zone-boundaries", "output",
+    "eeca_niwa_climate_boundaries", "eeca_niwa_climate_boundaries.gpkg",
+)
+
+# Simplification tolerance (degrees) for each detail level of the boundaries GeoJSON
+DETAIL_TOLERANCES = {"low": 0.01, "medium": 0.002, "high": 0.0005, "full": 0.0}
+
+
+class ClimateZoneIndex:
+    """
+    Point-in-polygon lookup from lat/lon to climate zone.
+
+    Multipolygons are exploded into their parts before building an STRtree, so that
+    each query only tests the few parts whose envelopes contain the point.
+    """
+
+    def __init__(self, geometries, climates):
+        import shapely
+
+        parts, owners = shapely.get_parts(np.asarray(geometries, dtype=object), return_index=True)
+        shapely.prepare(parts)
+        self._climates = np.asarray(climates, dtype=object)[owners]
+        self._tree = shapely.STRtree(parts)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load the climate zone boundaries from a GeoPackage (or any file geopandas can read)."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Climate zone boundaries not found at {path}")
+        import geopandas as gpd
+
+        gdf = gpd.read_file(path)
+        return cls(gdf.geometry.values, gdf["climate"].values)
+
+    def lookup(self, lat, lon):
+        """
+        Return the climate zone for each lat/lon point as an object array, with None
+        for points outside every zone. Points on a shared boundary take the first match.
+        """
+        import shapely
+
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        # The boundaries are stored with longitudes in [0, 360] so the Chatham Islands are contiguous
+        lon = np.where(lon < 0, lon + 360, lon)
+        points_index, parts_index = self._tree.query(shapely.points(lon, lat), predicate="intersects")
+        climates = np.full(len(lat), None, dtype=object)
+        # Assign in reverse so the first match for each point wins
+        climates[points_index[::-1]] = self._climates[parts_index[::-1]]
+        return climates
+
+
+class ClimateZoneGeoJSON:
+    """
+    Climate zone boundaries as GeoJSON, simplified to each detail level and
+    serialised and compressed once up front. Each variant carries a strong ETag
+    derived from its content.
+    """
+
+    def __init__(self, gdf, tolerances=DETAIL_TOLERANCES):
+        self.variants = {}
+        for detail, tolerance in tolerances.items():
+            simplified = gdf.assign(geometry=gdf.geometry.simplify(tolerance, preserve_topology=True)) if tolerance else gdf
+            body = simplified.to_json().encode()
+            encodings = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                encodings["br"] = brotli.compress(body, quality=11)
+            self.variants[detail] = (hashlib.sha256(body).hexdigest()[:32], encodings)
+
+    @classmethod
+    def from_file(cls, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Climate zone boundaries not found at {path}")
+        import geopandas as gpd
+
+        return cls(gpd.read_file(path))
+
+    def get(self, detail, accept_encoding=""):
+        """Return (etag, content encoding, body) for a detail level, preferring brotli then gzip."""
+        etag, encodings = self.variants[detail]
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in accept_encoding.split(",")
+            if not token.replace(" ", "").endswith(";q=0")
+        }
+        for encoding in ("br", "gzip"):
+            if encoding in encodings and encoding in accepted:
+                # Compressed representations need their own strong ETag
+                return f'"{etag}-{encoding}"', encoding, encodings[encoding]
+        return f'"{etag}"', "identity", encodings["identity"]
+
+
+def _boundaries_path(path):
+    return path or os.environ.get("CLIMATE_ZONE_BOUNDARIES", DEFAULT_BOUNDARIES_PATH)
+
+
+@lru_cache(maxsize=None)
+def load_climate_zone_geojson(path=None):
+    """Load and cache the pre-compressed boundaries GeoJSON; the path defaults to $CLIMATE_ZONE_BOUNDARIES."""
+    return ClimateZoneGeoJSON.from_file(_boundaries_path(path))
+
+
+@lru_cache(maxsize=None)
+def load_climate_zone_index(path=None):
+    """Load and cache the climate zone index; the path defaults to $CLIMATE_ZONE_BOUNDARIES."""
+    return ClimateZoneIndex.from_file(_boundaries_path(path))
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+
+def validate_batch(model: Type[BaseModel], items: List[Any]) -> Tuple[List[int], List[BaseModel], Dict[int, list]]:
+    """
+    Validate each item of a batch against the model independently, so that one
+    bad row does not fail the batch. Returns the indices and models of the valid
+    items, and a mapping from index to validation errors for the rest.
+    """
+    indices, models, errors = [], [], {}
+    for i, item in enumerate(items):
+        try:
+            models.append(model.model_validate(item))
+            indices.append(i)
+        except ValidationError as e:
+            errors[i] = e.errors(include_url=False, include_context=False)
+    return indices, models, errors
+
+
+def climate_zone_index():
+    """Dependency returning the loaded climate zone index, or 503 if it is unavailable."""
+    from fastapi import HTTPException
+    from .climate_zones import load_climate_zone_index
+
+    try:
+        return load_climate_zone_index()
+    except (FileNotFoundError, ImportError) as e:
+        raise HTTPException(status_code=503, detail=f"Climate zone lookup unavailable: {e}")
+
+
+def climate_zone_geojson():
+    """Dependency returning the pre-compressed boundaries GeoJSON, or 503 if it is unavailable."""
+    from fastapi import HTTPException
+    from .climate_zones import load_climate_zone_geojson
+
+    try:
+        return load_climate_zone_geojson()
+    except (FileNotFoundError, ImportError) as e:
+        raise HTTPException(status_code=503, detail=f"Climate zone boundaries unavailable: {e}")
@@ -0,0 +1,53 @@
+"""
+Opt-in fast JSON path for the calculation endpoints.
+
+When enabled (FAST_JSON=1 and orjson installed), request bodies are decoded with
+orjson instead of the standard library, and endpoints wrapped with json_response
+return bytes rendered by orjson directly, skipping FastAPI's jsonable_encoder.
+Routes keep their signatures, so the OpenAPI schema is unchanged either way.
+"""
+import os
+
+from fastapi import Request, Response
+
+from .metrics import TimedRoute
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library path is used without it
+    orjson = None
+
+ENABLED = os.environ.get("FAST_JSON", "") == "1" and orjson is not None
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class ORJSONRequest(Request):
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class FastJSONRoute(TimedRoute):
+    """Route class that decodes request bodies with orjson when the fast path is enabled."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            if ENABLED:
+                request = ORJSONRequest(request.scope, request.receive)
+            return await handler(request)
+
+        return route_handler
+
+
+def json_response(content):
+    """Render content with orjson when the fast path is enabled, else return it for FastAPI to encode."""
+    return ORJSONResponse(content) if ENABLED else content
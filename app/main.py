@@ -1,23 +1,38 @@
 from fastapi import FastAPI, responses
-from .api import heating, water_heating
-import uvicorn
+from .api import cache, climate_zone, heating, metrics, streaming, water_heating
+from .climate_zones import load_climate_zone_geojson, load_climate_zone_index
+from .metrics import SLOW_REQUEST_SECONDS, MetricsMiddleware, metrics_registry
 
 app = FastAPI()
+app.add_middleware(MetricsMiddleware, registry=metrics_registry, slow_request_seconds=SLOW_REQUEST_SECONDS)
 
 @app.on_event("startup")
 def startup_event():
     print("Visit http://localhost:8000 or http://127.0.0.1:8000 to access the app.")
 
+@app.on_event("startup")
+def load_climate_zones():
+    try:
+        load_climate_zone_index()
+        load_climate_zone_geojson()
+    except (FileNotFoundError, ImportError) as e:
+        print(f"Climate zone lookup unavailable: {e}")
+
 @app.get("/")
 def main():
     return responses.RedirectResponse(url='/docs/')
 
 app.include_router(heating.router)
 app.include_router(water_heating.router)
+app.include_router(streaming.router)
+app.include_router(climate_zone.router)
+app.include_router(cache.router)
+app.include_router(metrics.router)
 
 def run():
-    """Function to run the Uvicorn server."""
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    """Function to run the Uvicorn server; see app.server for the options."""
+    from .server import run as run_server
+    run_server()
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,208 @@
+"""
+Per-route request metrics in Prometheus text format.
+
+MetricsMiddleware counts requests by route and status and records their latency.
+Routes built with TimedRoute also record how long each request spent in
+validation (reading and validating the body), calculation (the endpoint itself)
+and serialization (encoding the response). Requests slower than a threshold can
+be logged.
+"""
+import contextvars
+import inspect
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_timings = contextvars.ContextVar("timings", default=None)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.durations = {}
+        self.phases = {}
+
+    def observe(self, method, route, status, elapsed, phases=None):
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.durations.setdefault((method, route), Histogram()).observe(elapsed)
+            for phase, value in (phases or {}).items():
+                self.phases.setdefault((method, route, phase), Histogram()).observe(value)
+
+    def clear(self):
+        with self._lock:
+            self.requests.clear()
+            self.durations.clear()
+            self.phases.clear()
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+            lines += [
+                "# HELP http_request_duration_seconds Request latency by route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), histogram in sorted(self.durations.items()):
+                lines += _render_histogram("http_request_duration_seconds", histogram, method=method, route=route)
+            lines += [
+                "# HELP http_request_phase_duration_seconds Time spent in validation, calculation and serialization by route.",
+                "# TYPE http_request_phase_duration_seconds histogram",
+            ]
+            for (method, route, phase), histogram in sorted(self.phases.items()):
+                lines += _render_histogram("http_request_phase_duration_seconds", histogram, method=method, route=route, phase=phase)
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(name, histogram, **labels):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def phase_durations(timings):
+    """Split the handler's timestamps into validation, calculation and serialization durations."""
+    if "handler_start" not in timings or "handler_end" not in timings:
+        return {}
+    if "endpoint_start" not in timings:
+        # The request never reached the endpoint, e.g. it failed validation
+        return {"validation": timings["handler_end"] - timings["handler_start"]}
+    endpoint_end = timings.get("endpoint_end", timings["handler_end"])
+    return {
+        "validation": timings["endpoint_start"] - timings["handler_start"],
+        "calculation": endpoint_end - timings["endpoint_start"],
+        "serialization": timings["handler_end"] - endpoint_end,
+    }
+
+
+def _timed_endpoint(endpoint):
+    """Wrap an endpoint to record when it starts and finishes, keeping its signature for FastAPI."""
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def timed(*args, **kwargs):
+            timings = _timings.get()
+            if timings is not None:
+                timings["endpoint_start"] = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings["endpoint_end"] = time.perf_counter()
+    else:
+        @wraps(endpoint)
+        def timed(*args, **kwargs):
+            # Runs in the threadpool, which copies the request's context, so this is the same dict
+            timings = _timings.get()
+            if timings is not None:
+                timings["endpoint_start"] = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings["endpoint_end"] = time.perf_counter()
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """Route class that records validation, calculation and serialization time for MetricsMiddleware."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request):
+            timings = request.scope.setdefault("timings", {})
+            timings["handler_start"] = time.perf_counter()
+            token = _timings.set(timings)
+            try:
+                return await handler(request)
+            finally:
+                _timings.reset(token)
+                timings["handler_end"] = time.perf_counter()
+
+        return route_handler
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, statuses and latencies per route template."""
+
+    def __init__(self, app, registry, slow_request_seconds=None):
+        self.app = app
+        self.registry = registry
+        self.slow_request_seconds = slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            # Label by route template rather than raw path to keep the label set bounded
+            route_path = getattr(route, "path", "unmatched")
+            phases = phase_durations(scope.get("timings", {}))
+            self.registry.observe(scope["method"], route_path, status, elapsed, phases)
+            if self.slow_request_seconds is not None and elapsed >= self.slow_request_seconds:
+                logger.warning(
+                    "Slow request: %s %s -> %s in %.3fs %s", scope["method"], scope["path"], status, elapsed,
+                    " ".join(f"{phase}={value:.3f}s" for phase, value in phases.items()),
+                )
+
+
+metrics_registry = MetricsRegistry()
+SLOW_REQUEST_SECONDS = float(os.environ["SLOW_REQUEST_SECONDS"]) if os.environ.get("SLOW_REQUEST_SECONDS") else None
@@ -11,4 +11,8 @@ class SpaceHeatingModel(BaseModel):
 class WaterHeatingModel(BaseModel):
     volume_litres: float
     temp_increase_celsius: float
-    efficiency: float
\ No newline at end of file
+    efficiency: float
+
+class LocationModel(BaseModel):
+    lat: float
+    lon: float
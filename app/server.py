@@ -0,0 +1,62 @@
+"""
+Command line entry point for serving the app with Uvicorn.
+
+Production mode (the default) runs several worker processes without the reloader,
+using uvloop and httptools when they are installed. Development mode (--dev) runs
+a single auto-reloading process. Every option can also be set by environment
+variable, which is how the container is configured.
+"""
+import argparse
+import importlib.util
+import os
+
+APP = "app.main:app"
+
+
+def _has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+
+def server_options(argv=None, environ=os.environ):
+    """Build the keyword arguments for uvicorn.run from command line flags and environment variables."""
+    parser = argparse.ArgumentParser(description="Run the home efficiency calculator API.")
+    parser.add_argument("--dev", action="store_true", default=environ.get("APP_ENV", "").lower() in ("dev", "development"),
+                        help="Single process with auto-reload (env APP_ENV=dev)")
+    parser.add_argument("--host", default=environ.get("HOST", "0.0.0.0"), help="Bind address (env HOST)")
+    parser.add_argument("--port", type=int, default=int(environ.get("PORT", 8000)), help="Bind port (env PORT)")
+    parser.add_argument("--workers", type=int, default=int(environ.get("WEB_CONCURRENCY", 0)) or None,
+                        help="Worker processes, default CPU count (env WEB_CONCURRENCY)")
+    parser.add_argument("--keep-alive", type=int, default=int(environ.get("KEEP_ALIVE", 5)),
+                        help="Seconds to hold idle keep-alive connections open (env KEEP_ALIVE)")
+    parser.add_argument("--backlog", type=int, default=int(environ.get("BACKLOG", 2048)),
+                        help="Maximum pending connections (env BACKLOG)")
+    parser.add_argument("--graceful-timeout", type=int, default=int(environ.get("GRACEFUL_TIMEOUT", 30)),
+                        help="Seconds to let in-flight requests finish on shutdown (env GRACEFUL_TIMEOUT)")
+    parser.add_argument("--access-log", action="store_true", default=environ.get("ACCESS_LOG", "") == "1",
+                        help="Log every request in production mode (env ACCESS_LOG=1)")
+    args = parser.parse_args(argv)
+
+    options = {
+        "host": args.host,
+        "port": args.port,
+        "timeout_keep_alive": args.keep_alive,
+        "backlog": args.backlog,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+    }
+    if args.dev:
+        options["reload"] = True
+    else:
+        options.update(
+            workers=args.workers or os.cpu_count() or 1,
+            loop="uvloop" if _has_module("uvloop") else "asyncio",
+            http="httptools" if _has_module("httptools") else "h11",
+            access_log=args.access_log,
+        )
+    return options
+
+
+def run(argv=None):
+    """Function to run the Uvicorn server."""
+    import uvicorn
+
+    uvicorn.run(APP, **server_options(argv))
@@ -0,0 +1,71 @@
+"""
+Run the benchmark suite and optionally compare it with a stored baseline.
+
+Usage:
+    python -m benchmarks --output bench.json
+    python -m benchmarks --output bench.json --baseline benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks --skip-load
+
+Exits with status 1 if any metric regresses past the threshold or any load test request fails.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+from . import compare, load, micro
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the calculator benchmarks.")
+    parser.add_argument("--output", default="bench.json", help="Where to write the results as JSON")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed regression as a fraction (default 0.1)")
+    parser.add_argument("--skip-micro", action="store_true", help="Skip the microbenchmarks")
+    parser.add_argument("--skip-load", action="store_true", help="Skip the HTTP load test")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients for the load test")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to drive each endpoint")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local server")
+    parser.add_argument("--batch-size", type=int, default=100, help="Households per batch request")
+    parser.add_argument("--url", help="Drive an already running server instead of starting one")
+    args = parser.parse_args(argv)
+
+    metrics = {}
+    if not args.skip_micro:
+        metrics.update(micro.run())
+    if not args.skip_load:
+        metrics.update(load.run(args.concurrency, args.duration, args.workers, args.batch_size, args.url))
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "metrics": metrics,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    for name, value in sorted(metrics.items()):
+        print(f"{name:50} {value:14.2f}")
+    print(f"Wrote {args.output}")
+
+    failed = False
+    errors = {name: value for name, value in metrics.items() if name.endswith(".errors") and value}
+    for name, value in errors.items():
+        print(f"FAIL {name}: {value} failed requests")
+        failed = True
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["metrics"]
+        for name, base, current, change in compare.regressions(metrics, baseline, args.threshold):
+            print(f"REGRESSION {name}: {base:.2f} -> {current:.2f} ({change:+.1%})")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""Compare a benchmark run against a stored baseline."""
+
+# Metric name suffixes where a larger value is better; for everything else smaller is better
+HIGHER_IS_BETTER = (".ops_per_sec", ".rps")
+
+
+def regressions(current, baseline, threshold=0.1):
+    """
+    Return (name, baseline, current, change) for every metric that got worse than the
+    baseline by more than threshold (a fraction, so 0.1 is 10%). Metrics missing from
+    either run are ignored, as are error counts, which are checked separately.
+    """
+    found = []
+    for name, base in sorted(baseline.items()):
+        if name not in current or name.endswith(".errors") or not base:
+            continue
+        change = (current[name] - base) / base
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        if worse > threshold:
+            found.append((name, base, current[name], change))
+    return found
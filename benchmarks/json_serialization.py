@@ -0,0 +1,64 @@
+"""
+Throughput of the heating endpoints with the default JSON path and the orjson path.
+
+Requests go straight to the ASGI app in-process, so the numbers measure FastAPI
+validation, calculation and serialisation without any network overhead.
+
+Usage:
+    python -m benchmarks.json_serialization --batch-size 1000 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app import fast_json
+from app.main import app
+from .payloads import SPACE_HEATING, WATER_HEATING, space_heating, water_heating
+
+
+async def _throughput(path, body, requests):
+    content = json.dumps(body).encode()
+    headers = {"Content-Type": "application/json"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post(path, content=content, headers=headers)
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.post(path, content=content, headers=headers)
+            response.raise_for_status()
+        return requests / (time.perf_counter() - start)
+
+
+def run(batch_size=1000, requests=200):
+    """Return requests per second for each endpoint with the fast path off and on."""
+    cases = {
+        "/space-heating/": SPACE_HEATING,
+        "/water-heating/": WATER_HEATING,
+        "/space-heating/batch": space_heating(batch_size),
+        "/water-heating/batch": water_heating(batch_size),
+    }
+    results = {}
+    for path, body in cases.items():
+        results[path] = {}
+        for label, enabled in (("default", False), ("orjson", True)):
+            fast_json.ENABLED = enabled
+            results[path][label] = asyncio.run(_throughput(path, body, requests))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    if fast_json.orjson is None:
+        raise SystemExit("orjson is not installed: python -m pip install .[fast]")
+    print(f"{'endpoint':24} {'default req/s':>14} {'orjson req/s':>14} {'speedup':>8}")
+    for path, rates in run(args.batch_size, args.requests).items():
+        print(f"{path:24} {rates['default']:14.1f} {rates['orjson']:14.1f} {rates['orjson'] / rates['default']:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
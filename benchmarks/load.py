@@ -0,0 +1,113 @@
+"""
+HTTP load generator for the API.
+
+Starts the app under uvicorn on a free local port, then drives each endpoint with a
+fixed number of concurrent clients, each sending requests back to back, and
+reports throughput and latency percentiles.
+"""
+import asyncio
+import contextlib
+import itertools
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from .payloads import space_heating, water_heating
+
+
+def endpoints(batch_size=100):
+    """The requests to drive, as path -> list of bodies to cycle through."""
+    return {
+        "/space-heating/": space_heating(1000),
+        "/water-heating/": water_heating(1000),
+        "/space-heating/batch": [space_heating(batch_size)],
+        "/water-heating/batch": [water_heating(batch_size)],
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def local_server(workers=1, startup_timeout=30.0):
+    """Run the app under uvicorn in a subprocess and yield its base URL."""
+    port = _free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+    ])
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                if httpx.get(f"{base_url}/openapi.json").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def _drive(client, path, bodies, concurrency, duration):
+    bodies = [json.dumps(body).encode() for body in bodies]
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(offset):
+        nonlocal errors
+        for body in itertools.islice(itertools.cycle(bodies), offset, None):
+            if time.perf_counter() >= deadline:
+                return
+            start = time.perf_counter()
+            response = await client.post(path, content=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), errors, elapsed
+
+
+async def _run(base_url, concurrency, duration, batch_size):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    metrics = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for path, bodies in endpoints(batch_size).items():
+            # Warm up connections and caches before measuring
+            await _drive(client, path, bodies, concurrency, min(1.0, duration))
+            latencies, errors, elapsed = await _drive(client, path, bodies, concurrency, duration)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            metrics.update({
+                f"load.{path}.rps": len(latencies) / elapsed,
+                f"load.{path}.p50_ms": p50,
+                f"load.{path}.p95_ms": p95,
+                f"load.{path}.p99_ms": p99,
+                f"load.{path}.errors": errors,
+            })
+    return metrics
+
+
+def run(concurrency=16, duration=5.0, workers=1, batch_size=100, base_url=None):
+    """Return a dict of metric name to value. Starts a local server unless base_url is given."""
+    if base_url:
+        return asyncio.run(_run(base_url, concurrency, duration, batch_size))
+    with local_server(workers) as url:
+        return asyncio.run(_run(url, concurrency, duration, batch_size))
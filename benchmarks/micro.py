@@ -0,0 +1,31 @@
+"""
+Microbenchmarks for the calculation library and pydantic model construction.
+
+The calculations are timed both through the result cache (every call a hit) and
+uncached, by calling the wrapped function directly.
+"""
+import timeit
+
+from app.calculations import calculate_heating, calculate_water_heating
+from app.models import SpaceHeatingModel, WaterHeatingModel
+from .payloads import SPACE_HEATING, WATER_HEATING
+
+
+def _ops_per_sec(func, number, repeat):
+    """Best-of-repeat calls per second, which is the least noisy estimate for short functions."""
+    return number / min(timeit.repeat(func, number=number, repeat=repeat))
+
+
+def run(number=20000, repeat=5):
+    """Return a dict of metric name to calls per second."""
+    space_model = SpaceHeatingModel(**SPACE_HEATING)
+    water_model = WaterHeatingModel(**WATER_HEATING)
+    cases = {
+        "space_heating_model": lambda: SpaceHeatingModel(**SPACE_HEATING),
+        "water_heating_model": lambda: WaterHeatingModel(**WATER_HEATING),
+        "calculate_heating": lambda: calculate_heating.__wrapped__(space_model),
+        "calculate_water_heating": lambda: calculate_water_heating.__wrapped__(water_model),
+        "calculate_heating_cached": lambda: calculate_heating(space_model),
+        "calculate_water_heating_cached": lambda: calculate_water_heating(water_model),
+    }
+    return {f"micro.{name}.ops_per_sec": _ops_per_sec(func, number, repeat) for name, func in cases.items()}
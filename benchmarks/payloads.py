@@ -0,0 +1,14 @@
+"""Representative request bodies shared by the benchmarks."""
+
+SPACE_HEATING = {"area": 150, "insulation_level": "high", "average_temperature": 20, "heating_type": "gas"}
+WATER_HEATING = {"volume_litres": 100, "temp_increase_celsius": 50, "efficiency": 0.8}
+
+
+def space_heating(n):
+    """n distinct space heating households, so the result cache doesn't serve every request."""
+    return [dict(SPACE_HEATING, area=100 + i) for i in range(n)]
+
+
+def water_heating(n):
+    """n distinct water heating households."""
+    return [dict(WATER_HEATING, volume_litres=100 + i) for i in range(n)]
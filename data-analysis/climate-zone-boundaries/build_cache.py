@@ -0,0 +1,78 @@
+"""
+Content-hashed cache for the stages of the climate zone boundary pipeline.
+
+Each stage is keyed by a hash of its inputs: the upstream stage keys, the bytes of
+any input files, its parameters and the source of the functions it runs. A stage
+whose key is unchanged is loaded from the cache (GeoParquet) or skipped instead of
+being recomputed.
+"""
+import glob
+import hashlib
+import inspect
+import os
+
+import geopandas as gpd
+
+CACHE_PATH = "./output/.cache"
+
+
+def digest(*parts):
+    """Hash a sequence of bytes, strings, shapely geometries, functions or other reprs."""
+    h = hashlib.sha256()
+    for part in parts:
+        if hasattr(part, 'wkb'):
+            part = part.wkb
+        elif callable(part):
+            part = inspect.getsource(part)
+        if not isinstance(part, bytes):
+            part = repr(part).encode()
+        h.update(part)
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+def file_digest(*paths):
+    """Hash the contents of the given files, in order."""
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    return h.hexdigest()[:16]
+
+
+def shapefile_digest(shapefile_path):
+    """Hash a shapefile together with its sidecar files (.shx, .dbf, .prj, ...)."""
+    stem = os.path.splitext(shapefile_path)[0]
+    return file_digest(*sorted(glob.glob(f"{glob.escape(stem)}.*")))
+
+
+def cached_frame(stage, key, compute):
+    """Return the GeoDataFrame cached for this stage and key, computing and caching it on a miss."""
+    path = os.path.join(CACHE_PATH, f"{stage}-{key}.parquet")
+    if os.path.exists(path):
+        print(f"{stage}: up to date")
+        return gpd.read_parquet(path)
+    print(f"{stage}: running")
+    gdf = compute()
+    os.makedirs(CACHE_PATH, exist_ok=True)
+    for stale in glob.glob(os.path.join(CACHE_PATH, f"{stage}-*.parquet")):
+        os.remove(stale)
+    gdf.to_parquet(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    return gdf
+
+
+def cached_outputs(stage, key, outputs, produce):
+    """Run produce() to write the output files unless they exist and were written with this key."""
+    stamp = os.path.join(CACHE_PATH, f"{stage}.key")
+    if all(os.path.exists(path) for path in outputs) and os.path.exists(stamp):
+        with open(stamp) as f:
+            if f.read() == key:
+                print(f"{stage}: up to date")
+                return
+    print(f"{stage}: running")
+    produce()
+    os.makedirs(CACHE_PATH, exist_ok=True)
+    with open(stamp, 'w') as f:
+        f.write(key)
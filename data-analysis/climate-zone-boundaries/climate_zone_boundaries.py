@@ -1,24 +1,35 @@
 import os
-import fiona
-import pyproj
 import shutil
+import argparse
+import shapely
+import numpy as np
 import pandas as pd
-from pyproj import CRS
 import geopandas as gpd
-import matplotlib.pyplot as plt
 from shapely.ops import split, transform
-from shapely.geometry import shape, LineString
+from shapely.geometry import LineString
 from shapely.geometry import Polygon, MultiPolygon
 
+import process_river
 from process_river import load_and_process_river
 from ta_to_climate_zone import ta_to_climate_zone
+from build_cache import cached_frame, cached_outputs, digest, file_digest, shapefile_digest
 
 
 #### Constants
 
 RANGITIKEI_SPLIT_LINE = LineString([(lon, -39.833333333) for lon in (175.41445, 175.80)])
 OTEKAIEKE_END_POINTS = [(170.333, -44.904), (170.5846, -44.815)] # Force the river to cross the TA boundary
-OTEKAIEKE = load_and_process_river('Otekaieke River', OTEKAIEKE_END_POINTS)  # Get the river geometry, removing braiding and extending to just past the TA boundary
+# Territorial authorities split between two climate zones. Each piece of the TA takes the
+# south or north climate and name depending on which side of the split line's centroid
+# latitude its own centroid lies. Split lines are looked up by name at run time.
+SPLIT_RULES = [
+    {'ta_name': 'Waitaki District', 'split_line': 'Otekaieke River',
+     'south_climate': 'Dunedin', 'south_name': 'Waitaki District (Coastal)',
+     'north_climate': 'Central Otago', 'north_name': 'Waitaki District (Inland)'},
+    {'ta_name': 'Rangitikei District', 'split_line': 'Rangitikei Split Line',
+     'south_climate': 'Manawatu', 'south_name': 'Rangitikei District (Coastal)',
+     'north_climate': 'Taupo', 'north_name': 'Rangitikei District (Inland)'},
+]
 DIRECTORY_PATH = "./statsnz-territorial-authority-2023-clipped-generalised-SHP"
 INPUT_SHAPEFILE_NAME = "territorial-authority-2023-clipped-generalised.shp"
 INPUT_SHAPEFILE_PATH = f"{DIRECTORY_PATH}/{INPUT_SHAPEFILE_NAME}"
@@ -33,69 +44,73 @@ def transform_geometry(geometry, transformer):
     return transform(transformer.transform, geometry)
 
 
-def adjust_longitude(x, y):
-    """Adjust longitudes to be within [0, 360]."""
-    if x < 0:
-        x += 360
-    return x, y
+def shift_longitudes(geometries):
+    """Shift longitudes to be within [0, 360], operating on the coordinate arrays of all geometries at once."""
+    def shift(coords):
+        coords = coords.copy()
+        coords[coords[:, 0] < 0, 0] += 360
+        return coords
+    return shapely.transform(geometries, shift)
 
 
 def load_and_transform_shapefile(shapefile_path):
     """Load the shapefile, transform geometries to WGS84, and adjust longitudes."""
-    with fiona.open(shapefile_path, 'r') as shapefile:
-        # Get CRS from source shapefile
-        source_crs = shapefile.crs
-        target_crs = CRS("EPSG:4326")  # Define target CRS as WGS84
-        # Prepare transformer to convert source CRS to WGS84
-        transformer = pyproj.Transformer.from_crs(
-            source_crs, target_crs, always_xy=True
-        )
-        geometries = []
-        for feature in shapefile:
-            geometry = shape(feature["geometry"])
-            transformed_geometry = transform(transformer.transform, geometry)
-            adjusted_geometry = transform(adjust_longitude, transformed_geometry)
-            ta_name = feature['properties'].get('TA2023_V_1', 'Unknown')
-            climate = ta_to_climate_zone.get(ta_name, "Unknown")   
-            geometries.append((adjusted_geometry, climate, ta_name))
-        # Create GeoDataFrame
-        gdf = gpd.GeoDataFrame(geometries, columns=['geometry', 'climate', 'ta_name'], crs=target_crs.to_string())
-        return gdf
-
-
-def split_geometry_by_line(geom, line, crs):
-    """Split the given geometry by the given line and return all parts."""
-    split_result = split(geom, line)
-    polygons = [geom for geom in split_result.geoms if isinstance(geom, (Polygon, MultiPolygon))]
-    split_gdf = gpd.GeoDataFrame(geometry=polygons, crs=crs)
-    split_gdf = split_gdf.to_crs("EPSG:2193")  # Convert to NZTM for area calculation
-    split_gdf['area'] = split_gdf['geometry'].area
-    split_gdf = split_gdf.to_crs(crs)  # Convert back for plotting
-    return split_gdf
-
-
-def plot_geometries(gdf, additional_features, title):
-    """Plot the given list of Shapely geometries with climate zones, including river."""
+    gdf = gpd.read_file(shapefile_path).to_crs("EPSG:4326")
+    if 'TA2023_V_1' in gdf:
+        ta_names = gdf['TA2023_V_1']
+    else:
+        ta_names = pd.Series('Unknown', index=gdf.index)
+    return gpd.GeoDataFrame({
+        'geometry': shift_longitudes(gdf.geometry.values),
+        'climate': ta_names.map(ta_to_climate_zone).fillna("Unknown"),
+        'ta_name': ta_names,
+    }, crs="EPSG:4326")
+
+
+def polygons_path(geometries):
+    """
+    Build one compound matplotlib Path from an array of (Multi)Polygons, including
+    their interior rings. Exteriors are oriented counter-clockwise and holes clockwise
+    so the holes are left unfilled.
+    """
+    from matplotlib.path import Path
+    polygons = shapely.orient_polygons(shapely.get_parts(geometries))
+    coords, ring_index = shapely.get_coordinates(shapely.get_rings(polygons), return_index=True)
+    if not len(coords):
+        return Path(np.empty((0, 2)))
+    codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+    starts = np.r_[0, np.flatnonzero(np.diff(ring_index)) + 1]
+    codes[starts] = Path.MOVETO
+    codes[np.r_[starts[1:], len(coords)] - 1] = Path.CLOSEPOLY
+    return Path(coords, codes)
+
+
+def plot_geometries(gdf, additional_features, title, simplify_tolerance=None):
+    """
+    Plot the given Shapely geometries with climate zones, including river. Each
+    climate zone is drawn as a single patch. Pass simplify_tolerance (in degrees)
+    to simplify the geometries first for a quicker preview.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import PathPatch
     gdf = gdf[['geometry', 'climate', 'ta_name']]
-    geometries = list(gdf.itertuples(index=False, name=None))
+    geometries = gdf.geometry.values
+    if simplify_tolerance:
+        geometries = shapely.simplify(geometries, simplify_tolerance, preserve_topology=True)
     _, ax = plt.subplots(figsize=(10, 10))
     climate_colors = {}
-    unique_zones = sorted(set(zone for _, zone, _ in geometries))
+    unique_zones = sorted(set(gdf['climate']))
     cmap = plt.get_cmap('tab20', len(unique_zones))
     for i, zone in enumerate(unique_zones):
         climate_colors[zone] = cmap(i)
     legend_labels = {}
-    for geometry, climate, ta_name in geometries:
-        fill_color = climate_colors[climate]
-        if geometry.geom_type == 'Polygon':
-            xs, ys = geometry.exterior.xy
-            patch = ax.fill(xs, ys, alpha=0.5, fc=fill_color, edgecolor='black', label=ta_name)
-        elif geometry.geom_type == 'MultiPolygon':
-            for poly in geometry.geoms:
-                xs, ys = poly.exterior.xy
-                patch = ax.fill(xs, ys, alpha=0.5, fc=fill_color, edgecolor='black')
-        if climate not in legend_labels:
-            legend_labels[climate] = patch[0]
+    # Legend entries follow the order in which the zones first appear
+    for climate in dict.fromkeys(gdf['climate']):
+        patch = PathPatch(polygons_path(geometries[(gdf['climate'] == climate).values]),
+                          alpha=0.5, fc=climate_colors[climate], edgecolor='black')
+        ax.add_patch(patch)
+        legend_labels[climate] = patch
+    ax.autoscale_view()
     for feature_name, feature_geometry in additional_features.items():
         if feature_geometry.geom_type == 'LineString':
             xs, ys = feature_geometry.xy
@@ -118,67 +133,42 @@ def ensure_empty_directory(directory):
     os.makedirs(directory, exist_ok=True)
 
 
-def main():
-
-    ensure_empty_directory(OUTPUT_PATH)
-
-    # Load the TA shapefile and map the TA names to climate zones
-    ta_gdf = load_and_transform_shapefile(INPUT_SHAPEFILE_PATH)
-    additional_features = {
-        'Otekaieke River': OTEKAIEKE,
-        'Rangitikei Split Line': RANGITIKEI_SPLIT_LINE
-    }
-    plot_geometries(ta_gdf, additional_features, 'Territorial Authority Boundaries with Approximate Climate Zones')
-    plt.savefig(f'{OUTPUT_PATH}/1-territorial-authority-boundaries.png')
-
-    # Split Waitaki District based on the Otekaieke River.
-    ta_name = 'Waitaki District'
-    waitaki_geom = ta_gdf[ta_gdf['ta_name'] == ta_name]['geometry'].iloc[0]
-    split_waitaki = split_geometry_by_line(waitaki_geom, OTEKAIEKE, ta_gdf.crs)
+def apply_split_rules(ta_gdf, split_lines, rules=SPLIT_RULES):
+    """
+    Split every TA named in the rules by its split line in one pass, replacing each
+    with its pieces. Pieces are appended in rule order after the unsplit TAs.
+    """
+    rules = pd.DataFrame(rules)
+    geometries = ta_gdf.set_index('ta_name').geometry.loc[rules['ta_name']].values
+    lines = np.array([split_lines[name] for name in rules['split_line']], dtype=object)
+    owners, pieces = [], []
+    for i, (geometry, line) in enumerate(zip(geometries, lines)):
+        parts = [part for part in split(geometry, line).geoms if isinstance(part, (Polygon, MultiPolygon))]
+        owners.extend([i] * len(parts))
+        pieces.extend(parts)
+    owners = np.array(owners, dtype=int)
+    pieces = np.array(pieces, dtype=object)
     # Use lat to determine climate zone of each piece.
-    split_waitaki['centroid_lat'] = split_waitaki['geometry'].apply(lambda g: g.centroid.y)
-    threshold_lat = OTEKAIEKE.centroid.y
-    split_waitaki['climate'] = ['Dunedin' if lat < threshold_lat else 'Central Otago' for lat in split_waitaki['centroid_lat']]
-    split_waitaki['ta_name'] = ['Waitaki District (Coastal)' if lat < threshold_lat else 'Waitaki District (Inland)' for lat in split_waitaki['centroid_lat']]
-    new_gdf = gpd.GeoDataFrame(
-        [{'geometry': split_waitaki.iloc[i]['geometry'],
-        'climate': split_waitaki.iloc[i]['climate'],
-        'ta_name': split_waitaki.iloc[i]['ta_name']} for i in range(len(split_waitaki))],
-        crs=ta_gdf.crs
-    )
-    # Replace the original Waitaki District geometry with the split geometries
-    ta_gdf = ta_gdf[ta_gdf['ta_name'] != ta_name]
-    ta_gdf = pd.concat([ta_gdf, new_gdf], ignore_index=True)
-
-    # Split the Rangitikei District based on the Rangitikei Split Line (latitude).
-    ta_name = 'Rangitikei District'
-    rangitikei_geom = ta_gdf[ta_gdf['ta_name'] == ta_name]['geometry'].iloc[0]
-    split_rangitikei = split_geometry_by_line(rangitikei_geom, RANGITIKEI_SPLIT_LINE, ta_gdf.crs)
-    # Use lat to determine climate zone of each piece.
-    split_rangitikei['centroid_lat'] = split_rangitikei['geometry'].apply(lambda g: g.centroid.y)
-    threshold_lat = RANGITIKEI_SPLIT_LINE.centroid.y
-    split_rangitikei['climate'] = ['Manawatu' if lat < threshold_lat else 'Taupo' for lat in split_rangitikei['centroid_lat']]
-    split_rangitikei['ta_name'] = ['Rangitikei District (Coastal)' if lat < threshold_lat else 'Rangitikei District (Inland)' for lat in split_rangitikei['centroid_lat']]
-    new_gdf = gpd.GeoDataFrame(
-        [{'geometry': split_rangitikei.iloc[i]['geometry'],
-        'climate': split_rangitikei.iloc[i]['climate'],
-        'ta_name': split_rangitikei.iloc[i]['ta_name']} for i in range(len(split_rangitikei))],
-        crs=ta_gdf.crs
-    )
-    # Replace the original Rangitikei District geometry with the split geometries
-    ta_gdf = ta_gdf[ta_gdf['ta_name'] != ta_name]
-    ta_gdf = pd.concat([ta_gdf, new_gdf], ignore_index=True)
-    plot_geometries(ta_gdf, additional_features, 'Territorial Authority Boundaries with Corrected Climate Zones')
-    plt.savefig(f'{OUTPUT_PATH}/2-territorial-authority-boundaries-climate-zones.png')
-
-    # Merge contiguous territorial authorities with the same climate zone
+    south = shapely.get_y(shapely.centroid(pieces)) < shapely.get_y(shapely.centroid(lines))[owners]
+    piece_rules = rules.iloc[owners]
+    new_gdf = gpd.GeoDataFrame({
+        'geometry': pieces,
+        'climate': np.where(south, piece_rules['south_climate'], piece_rules['north_climate']),
+        'ta_name': np.where(south, piece_rules['south_name'], piece_rules['north_name']),
+    }, crs=ta_gdf.crs)
+    ta_gdf = ta_gdf[~ta_gdf['ta_name'].isin(rules['ta_name'])]
+    return pd.concat([ta_gdf, new_gdf], ignore_index=True)
+
+
+def dissolve_climate_zones(ta_gdf):
+    """Merge contiguous territorial authorities with the same climate zone."""
     merged_gdf = ta_gdf.dissolve(by='climate', aggfunc='first')
     merged_gdf.reset_index(inplace=True)
-    additional_features = {}
-    plot_geometries(merged_gdf, additional_features, 'EECA-reconstructed NIWA Climate Zones')
-    plt.savefig(f'{OUTPUT_PATH}/3-eeca-niwa-climate-zones.png')
+    return merged_gdf
+
 
-    # Save the merged geometries to the output shapefile
+def export_boundaries(merged_gdf):
+    """Save the merged geometries as a shapefile, GeoJSON and GeoPackage."""
     ensure_empty_directory(os.path.dirname(OUTPUT_SHAPEFILE_PATH))
     merged_gdf.to_file(OUTPUT_SHAPEFILE_PATH)
     print(f"Saved merged climate zone boundaries to {OUTPUT_SHAPEFILE_PATH}")
@@ -190,8 +180,70 @@ def main():
     # Save as a geopackage for use in the DNA library
     merged_gdf.to_file(OUTPUT_SHAPEFILE_PATH.replace('.shp', '.gpkg'), driver='GPKG')
     print(f"Saved merged climate zone boundaries to {OUTPUT_SHAPEFILE_PATH.replace('.shp', '.gpkg')}")
+
+
+def save_plot(gdf, additional_features, title, path):
+    """Plot the geometries and save the figure to path."""
+    import matplotlib.pyplot as plt
+    plot_geometries(gdf, additional_features, title)
+    plt.savefig(path)
+    plt.close()
+
+
+def main(plots=True):
+    """
+    Build the climate zone boundaries as a sequence of cached stages: load, river,
+    split, dissolve, export and plot. Each stage is keyed by a hash of its inputs,
+    so a re-run only redoes the stages whose inputs have changed.
+    """
+    os.makedirs(OUTPUT_PATH, exist_ok=True)
+
+    # Load the TA shapefile and map the TA names to climate zones
+    load_key = digest('load', shapefile_digest(INPUT_SHAPEFILE_PATH), ta_to_climate_zone,
+                      load_and_transform_shapefile, shift_longitudes)
+    ta_gdf = cached_frame('load', load_key, lambda: load_and_transform_shapefile(INPUT_SHAPEFILE_PATH))
+
+    # Get the river geometry, removing braiding and extending to just past the TA boundary
+    river_key = digest('river', file_digest(process_river.GPKG_PATH), OTEKAIEKE_END_POINTS, process_river)
+    river_gdf = cached_frame('river', river_key, lambda: gpd.GeoDataFrame(
+        geometry=[load_and_process_river('Otekaieke River', OTEKAIEKE_END_POINTS)], crs="EPSG:4326"))
+    otekaieke = river_gdf.geometry.iloc[0]
+
+    # Split Waitaki and Rangitikei between their climate zones
+    split_lines = {
+        'Otekaieke River': otekaieke,
+        'Rangitikei Split Line': RANGITIKEI_SPLIT_LINE
+    }
+    split_key = digest('split', load_key, river_key, RANGITIKEI_SPLIT_LINE, SPLIT_RULES, apply_split_rules)
+    split_gdf = cached_frame('split', split_key, lambda: apply_split_rules(ta_gdf, split_lines))
+
+    # Merge contiguous territorial authorities with the same climate zone
+    dissolve_key = digest('dissolve', split_key, dissolve_climate_zones)
+    merged_gdf = cached_frame('dissolve', dissolve_key, lambda: dissolve_climate_zones(split_gdf))
+
+    # Save the merged geometries to the output shapefile, GeoJSON and GeoPackage
+    export_key = digest('export', dissolve_key, export_boundaries)
+    outputs = [OUTPUT_SHAPEFILE_PATH] + [OUTPUT_SHAPEFILE_PATH.replace('.shp', ext) for ext in ('.geojson', '.gpkg')]
+    cached_outputs('export', export_key, outputs, lambda: export_boundaries(merged_gdf))
+
+    if plots:
+        figures = [
+            (ta_gdf, load_key, split_lines, 'Territorial Authority Boundaries with Approximate Climate Zones',
+             f'{OUTPUT_PATH}/1-territorial-authority-boundaries.png'),
+            (split_gdf, split_key, split_lines, 'Territorial Authority Boundaries with Corrected Climate Zones',
+             f'{OUTPUT_PATH}/2-territorial-authority-boundaries-climate-zones.png'),
+            (merged_gdf, dissolve_key, {}, 'EECA-reconstructed NIWA Climate Zones',
+             f'{OUTPUT_PATH}/3-eeca-niwa-climate-zones.png'),
+        ]
+        for gdf, key, features, title, path in figures:
+            plot_key = digest('plot', key, river_key, RANGITIKEI_SPLIT_LINE, title, plot_geometries, save_plot)
+            cached_outputs(f'plot-{os.path.basename(path)}', plot_key, [path],
+                           lambda: save_plot(gdf, features, title, path))
     return merged_gdf
 
 
 if __name__ == "__main__":
-    merged_gdf = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build the EECA/NIWA climate zone boundaries.")
+    parser.add_argument('--no-plots', action='store_true', help="Skip rendering the PNG plots (and importing matplotlib)")
+    args = parser.parse_args()
+    merged_gdf = main(plots=not args.no_plots)
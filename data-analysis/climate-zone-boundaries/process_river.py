@@ -6,6 +6,59 @@ from shapely.ops import nearest_points
 # Setting a constant for the path to the GeoPackage
 GPKG_PATH = './lds-nz-river-name-lines-pilot-GPKG/nz-river-name-lines-pilot.gpkg'
 
+def _tree_distances(G, source):
+    """
+    Weighted distances and predecessors from source in a tree, by a single
+    depth-first traversal (linear time, since paths in a tree are unique).
+    """
+    distances = {source: 0.0}
+    predecessors = {source: None}
+    stack = [source]
+    while stack:
+        node = stack.pop()
+        for neighbour, edge in G[node].items():
+            if neighbour not in distances:
+                distances[neighbour] = distances[node] + edge['weight']
+                predecessors[neighbour] = node
+                stack.append(neighbour)
+    return distances, predecessors
+
+
+def _graph_distances(G, source):
+    """Weighted shortest-path distances and predecessors from source in a graph with cycles."""
+    predecessors, distances = nx.dijkstra_predecessor_and_distance(G, source, weight='weight')
+    return distances, {node: (preds[0] if preds else None) for node, preds in predecessors.items()}
+
+
+def _path_to(predecessors, target):
+    path = []
+    while target is not None:
+        path.append(target)
+        target = predecessors[target]
+    return path
+
+
+def _longest_endpoint_path(G, endpoints):
+    """
+    Longest shortest path between two endpoints of a connected component, by
+    repeated farthest-endpoint sweeps. Two sweeps give the exact diameter of a tree;
+    when braiding leaves cycles the sweeps fall back to Dijkstra and repeat while the
+    path keeps getting longer.
+    """
+    is_tree = G.number_of_edges() == G.number_of_nodes() - 1
+    distances_from = _tree_distances if is_tree else _graph_distances
+    source = endpoints[0]
+    best_length, best_path = 0, None
+    for _ in range(2 if is_tree else len(endpoints)):
+        distances, predecessors = distances_from(G, source)
+        target = max(endpoints, key=distances.__getitem__)
+        if distances[target] <= best_length:
+            break
+        best_length, best_path = distances[target], _path_to(predecessors, target)
+        source = target
+    return best_length, best_path
+
+
 def simplified_river_path(geometries, extend_to_end_points=None):
     """
     Extracts the longest simple path from a collection of MultiLineString geometries,
@@ -20,20 +73,20 @@ def simplified_river_path(geometries, extend_to_end_points=None):
         elif isinstance(multi_line, LineString):
             start, end = tuple(multi_line.coords[0]), tuple(multi_line.coords[-1])
             G.add_edge(start, end, weight=multi_line.length)
-    endpoints = [node for node, degree in G.degree() if degree == 1]
-    if not endpoints:
-        return None
+    order = {node: i for i, node in enumerate(G)}
     max_length = 0
     best_path = None
-    for i in range(len(endpoints)):
-        for j in range(i + 1, len(endpoints)):
-            try:
-                length, path = nx.single_source_dijkstra(G, endpoints[i], endpoints[j], weight='weight')
-                if length > max_length:
-                    max_length = length
-                    best_path = path
-            except nx.NetworkXNoPath:
-                continue
+    for component in nx.connected_components(G):
+        endpoints = sorted((node for node in component if G.degree(node) == 1), key=order.__getitem__)
+        if len(endpoints) < 2:
+            continue
+        length, path = _longest_endpoint_path(G.subgraph(component), endpoints)
+        if length > max_length:
+            max_length = length
+            best_path = path
+    if best_path and order[best_path[0]] > order[best_path[-1]]:
+        # Run from the endpoint first seen in the data, as the pairwise search did
+        best_path = best_path[::-1]
     if best_path:
         extended_path = best_path
         if extend_to_end_points:
@@ -48,13 +101,32 @@ def simplified_river_path(geometries, extend_to_end_points=None):
         return LineString([Point(node) for node in extended_path])
     return None
 
-def load_and_process_river(name, extend_to_end_points=None):
+def load_rivers(names, bbox=None):
+    """
+    Read only the named rivers from the GeoPackage, filtering in the driver with
+    an attribute query (and optionally a bounding box) rather than loading every river.
+    """
+    quoted = ", ".join("'" + name.replace("'", "''") + "'" for name in names)
+    return gpd.read_file(GPKG_PATH, where=f"name IN ({quoted})", bbox=bbox)
+
+def load_and_process_rivers(names, extend_to_end_points=None, bbox=None):
+    """
+    Load several rivers from a single filtered read of the GeoPackage and return a
+    dict of simplified river paths by name. extend_to_end_points optionally maps
+    river names to the end points to extend each path to.
+    """
+    extend_to_end_points = extend_to_end_points or {}
+    rivers = load_rivers(names, bbox)
+    return {
+        name: simplified_river_path(rivers.geometry[rivers['name'] == name], extend_to_end_points.get(name))
+        for name in names
+    }
+
+def load_and_process_river(name, extend_to_end_points=None, bbox=None):
     """
     Load river data from a specified GeoPackage and process to find the simplified river path.
     """
-    rivers = gpd.read_file(GPKG_PATH)
-    river = rivers[rivers['name'] == name]
-    return simplified_river_path(river.geometry, extend_to_end_points)
+    return load_and_process_rivers([name], {name: extend_to_end_points}, bbox)[name]
 
 if __name__ == "__main__":
     import matplotlib.pyplot as plt
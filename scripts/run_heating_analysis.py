@@ -1,21 +1,118 @@
-from app.calculations import calculate_heating
-from app.models import SpaceHeatingModel
+"""
+Bulk heating analysis over a household input file.
 
-def run_heating_analysis():
-    properties = [
-        {"area": 150, "insulation_level": "high", "average_temperature": 20, "heating_type": "gas"},
-        {"area": 100, "insulation_level": "medium", "average_temperature": 18, "heating_type": "electric"},
-        {"area": 200, "insulation_level": "low", "average_temperature": 15, "heating_type": "oil"}
-    ]
+Streams a CSV or Parquet file in fixed-size chunks, runs the columnar calculations
+on each chunk across a pool of worker processes, and writes one part file per
+chunk into an output directory. Only a bounded number of chunks is held in memory
+at once, so memory use does not grow with the size of the input.
 
-    results = []
-    for prop in properties:
-        model = SpaceHeatingModel(**prop)
-        result = calculate_heating(model)
-        results.append(result)
+Usage:
+    python -m scripts.run_heating_analysis households.csv output/ --kind space --chunk-size 100000 --workers 8
+"""
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app.calculations import calculate_heating_frame, calculate_water_heating_frame
+
+CALCULATIONS = {
+    "space": calculate_heating_frame,
+    "water": calculate_water_heating_frame,
+}
+FORMATS = ("csv", "parquet")
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def file_format(path):
+    """Infer csv/parquet from a file extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "pq":
+        extension = "parquet"
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot infer file format of {path}; expected one of {FORMATS}")
+    return extension
+
+
+def read_chunks(input_path, chunk_size):
+    """Yield DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    if file_format(input_path) == "csv":
+        import pandas as pd
+        yield from pd.read_csv(input_path, chunksize=chunk_size)
+    else:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def part_path(output_dir, index, output_format):
+    return os.path.join(output_dir, f"part-{index:06d}.{output_format}")
+
+
+def process_chunk(kind, chunk, path):
+    """Calculate results for one chunk and write them atomically to path. Returns the row count."""
+    result = CALCULATIONS[kind](chunk, errors="coerce")
+    out = chunk.join(result)
+    tmp_path = f"{path}.tmp"
+    if path.endswith(".csv"):
+        out.to_csv(tmp_path, index=False)
+    else:
+        out.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return len(out)
+
+
+def run_heating_analysis(input_path, output_dir, kind="space", chunk_size=DEFAULT_CHUNK_SIZE,
+                         workers=None, resume=False, output_format=None):
+    """
+    Run the analysis over input_path, writing part files to output_dir.
+
+    With resume=True, chunks whose part file already exists are skipped, so an
+    interrupted run picks up from the last finished chunk. Returns the number of
+    rows processed in this run.
+    """
+    if kind not in CALCULATIONS:
+        raise ValueError(f"kind must be one of {sorted(CALCULATIONS)}")
+    output_format = output_format or file_format(input_path)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    rows = 0
+    if workers == 1:
+        for index, chunk in enumerate(read_chunks(input_path, chunk_size)):
+            path = part_path(output_dir, index, output_format)
+            if not (resume and os.path.exists(path)):
+                rows += process_chunk(kind, chunk, path)
+        return rows
+    # Keep at most two chunks per worker in flight so reading never runs far ahead
+    max_in_flight = 2 * workers
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for index, chunk in enumerate(read_chunks(input_path, chunk_size)):
+            path = part_path(output_dir, index, output_format)
+            if resume and os.path.exists(path):
+                continue
+            if len(pending) >= max_in_flight:
+                rows += pending.popleft().result()
+            pending.append(executor.submit(process_chunk, kind, chunk, path))
+        while pending:
+            rows += pending.popleft().result()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run heating calculations over a CSV or Parquet file of households.")
+    parser.add_argument("input", help="Input CSV or Parquet file with one household per row")
+    parser.add_argument("output_dir", help="Directory to write result part files to")
+    parser.add_argument("--kind", choices=sorted(CALCULATIONS), default="space", help="Calculation to run")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--resume", action="store_true", help="Skip chunks whose output already exists")
+    parser.add_argument("--output-format", choices=FORMATS, default=None, help="Output format (default: same as input)")
+    args = parser.parse_args(argv)
+    rows = run_heating_analysis(args.input, args.output_dir, kind=args.kind, chunk_size=args.chunk_size,
+                                workers=args.workers, resume=args.resume, output_format=args.output_format)
+    print(f"Processed {rows} rows into {args.output_dir}")
 
-    for result in results:
-        print(result)
 
 if __name__ == "__main__":
-    run_heating_analysis()
+    main()
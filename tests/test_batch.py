@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+
+from app.calculations import calculate_heating, calculate_water_heating
+from app.models import SpaceHeatingModel, WaterHeatingModel
+
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_space_heating_batch():
+    """
+    Test that the space heating batch endpoint matches the single-item calculation
+    and reports invalid items without failing the batch.
+    """
+    items = [
+        {"area": 150, "insulation_level": "high", "average_temperature": 20, "heating_type": "gas"},
+        {"area": "not a number", "insulation_level": "low", "average_temperature": 15, "heating_type": "oil"},
+        {"area": 100, "insulation_level": "medium", "average_temperature": 18, "heating_type": "electric"},
+    ]
+    response = client.post("/space-heating/batch", json=items)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is False
+    results = body["results"]
+    assert results[0] == {"success": True, "data": calculate_heating(SpaceHeatingModel(**items[0]))}
+    assert results[1]["success"] is False
+    assert results[1]["errors"][0]["loc"] == ["area"]
+    assert results[2] == {"success": True, "data": calculate_heating(SpaceHeatingModel(**items[2]))}
+
+
+def test_water_heating_batch():
+    """
+    Test that the water heating batch endpoint matches the single-item calculation
+    and reports zero efficiency as a per-item error.
+    """
+    items = [
+        {"volume_litres": 100, "temp_increase_celsius": 50, "efficiency": 0.8},
+        {"volume_litres": 100, "temp_increase_celsius": 50, "efficiency": 0},
+        {"volume_litres": 100},
+    ]
+    response = client.post("/water-heating/batch", json=items)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    expected = calculate_water_heating(WaterHeatingModel(**items[0]))["energy_required"]
+    assert results[0] == {"success": True, "energy_kwh": expected}
+    assert results[1]["success"] is False
+    assert results[1]["errors"][0]["loc"] == ["efficiency"]
+    assert results[2]["success"] is False
+    assert {tuple(e["loc"]) for e in results[2]["errors"]} == {("temp_increase_celsius",), ("efficiency",)}
+
+
+def test_batch_empty():
+    """
+    Test that an empty batch returns an empty result list.
+    """
+    response = client.post("/space-heating/batch", json=[])
+    assert response.json() == {"success": True, "results": []}
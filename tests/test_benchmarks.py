@@ -0,0 +1,35 @@
+import json
+
+from benchmarks import __main__ as bench, compare, micro
+
+
+def test_regressions():
+    """
+    Test that only metrics worse than the baseline by more than the threshold are reported.
+    """
+    baseline = {"micro.f.ops_per_sec": 100.0, "load./a.rps": 100.0, "load./a.p99_ms": 10.0, "load./a.errors": 0}
+    current = {"micro.f.ops_per_sec": 95.0, "load./a.rps": 80.0, "load./a.p99_ms": 12.0, "load./a.errors": 3}
+    found = {name for name, *_ in compare.regressions(current, baseline, threshold=0.1)}
+    assert found == {"load./a.rps", "load./a.p99_ms"}
+
+
+def test_micro_smoke():
+    """
+    Test that the microbenchmarks run and report positive rates.
+    """
+    results = micro.run(number=10, repeat=1)
+    assert "micro.calculate_heating.ops_per_sec" in results
+    assert all(value > 0 for value in results.values())
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    """
+    Test that the runner writes JSON results and exits non-zero when a metric regresses.
+    """
+    monkeypatch.setattr(micro, "run", lambda: {"micro.f.ops_per_sec": 50.0})
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"metrics": {"micro.f.ops_per_sec": 100.0}}))
+    output = tmp_path / "bench.json"
+    assert bench.main(["--skip-load", "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["metrics"] == {"micro.f.ops_per_sec": 50.0}
+    assert bench.main(["--skip-load", "--output", str(output), "--baseline", str(baseline)]) == 1
@@ -0,0 +1,75 @@
+from fastapi.testclient import TestClient
+
+from app.cache import ResultCache, cached, calculation_cache
+from app.calculations import calculate_water_heating
+from app.models import WaterHeatingModel
+
+from app.main import app
+
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = ResultCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    """
+    Test that entries expire after the TTL.
+    """
+    clock = FakeClock()
+    cache = ResultCache(maxsize=10, ttl=60, timer=clock)
+    cache.set("a", 1)
+    clock.now = 59
+    assert cache.get("a") == (True, 1)
+    clock.now = 61
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cached_canonical_key():
+    """
+    Test that payloads validating to the same model share a cache entry.
+    """
+    cache = ResultCache(maxsize=10)
+    calls = []
+    f = cached(cache)(lambda data: calls.append(data) or len(calls))
+    first = WaterHeatingModel(volume_litres="100", temp_increase_celsius=50, efficiency=0.8)
+    second = WaterHeatingModel.model_validate_json('{"efficiency": 0.80, "volume_litres": 100.0, "temp_increase_celsius": 5e1}')
+    assert f(first) == f(second) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_stats_endpoint():
+    """
+    Test that repeated water heating requests are served from the cache and reported in the stats.
+    """
+    calculation_cache.clear()
+    payload = {"volume_litres": 100, "temp_increase_celsius": 50, "efficiency": 0.8}
+    expected = calculate_water_heating(WaterHeatingModel(**payload))["energy_required"]
+    for _ in range(3):
+        response = client.post("/water-heating/", json=payload)
+        assert response.json()["energy_kwh"] == expected
+    stats = client.get("/cache/stats").json()["data"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+    assert stats["size"] == 1
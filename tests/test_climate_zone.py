@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+
+shapely = pytest.importorskip("shapely")
+
+from app.climate_zones import ClimateZoneIndex
+from app.dependencies import climate_zone_index
+from app.main import app
+
+
+# Two adjoining zones, one made of two islands, plus a zone across the antimeridian
+INDEX = ClimateZoneIndex(
+    [
+        shapely.MultiPolygon([shapely.box(170, -45, 172, -43), shapely.box(174, -45, 175, -44)]),
+        shapely.box(172, -45, 173, -43),
+        shapely.box(183, -45, 184, -43),
+    ],
+    ["Central Otago", "Dunedin", "East Coast"],
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_index():
+    app.dependency_overrides[climate_zone_index] = lambda: INDEX
+    yield
+    app.dependency_overrides.clear()
+
+
+def test_lookup():
+    """
+    Test the vectorised lookup, including multipolygon parts, negative longitudes and misses.
+    """
+    climates = INDEX.lookup([-44, -44.5, -44, -44, -30], [171, 174.5, 172.5, -176.5, 171])
+    assert climates.tolist() == ["Central Otago", "Central Otago", "Dunedin", "East Coast", None]
+
+
+def test_climate_zone_endpoint():
+    """
+    Test the single-point climate zone endpoint.
+    """
+    response = client.get("/climate-zone", params={"lat": -44, "lon": 172.5})
+    assert response.json() == {"success": True, "climate": "Dunedin"}
+    response = client.get("/climate-zone", params={"lat": 0, "lon": 0})
+    assert response.status_code == 404
+
+
+def test_climate_zone_batch_endpoint():
+    """
+    Test the batch climate zone endpoint with a bad item and a miss.
+    """
+    items = [{"lat": -44, "lon": 171}, {"lat": "x", "lon": 171}, {"lat": 0, "lon": 0}]
+    results = client.post("/climate-zone/batch", json=items).json()["results"]
+    assert results[0] == {"success": True, "climate": "Central Otago"}
+    assert results[1]["success"] is False
+    assert results[2] == {"success": True, "climate": None}
+
+
+def test_climate_zone_unavailable(monkeypatch, tmp_path):
+    """
+    Test that a missing boundaries file gives a 503 rather than an error.
+    """
+    app.dependency_overrides.clear()
+    monkeypatch.setenv("CLIMATE_ZONE_BOUNDARIES", str(tmp_path / "missing.gpkg"))
+    from app.climate_zones import load_climate_zone_index
+    load_climate_zone_index.cache_clear()
+    response = client.get("/climate-zone", params={"lat": -44, "lon": 172.5})
+    assert response.status_code == 503
+
+
+def test_climate_zone_boundaries_endpoint():
+    """
+    Test the boundaries GeoJSON endpoint: detail levels, compression and ETag revalidation.
+    """
+    gpd = pytest.importorskip("geopandas")
+    from app.climate_zones import ClimateZoneGeoJSON
+    from app.dependencies import climate_zone_geojson
+
+    circle = shapely.Point(172, -44).buffer(1, quad_segs=64)
+    boundaries = ClimateZoneGeoJSON(gpd.GeoDataFrame({"climate": ["Dunedin"]}, geometry=[circle], crs="EPSG:4326"))
+    app.dependency_overrides[climate_zone_geojson] = lambda: boundaries
+
+    low = client.get("/climate-zone/boundaries", params={"detail": "low"}, headers={"Accept-Encoding": "gzip"})
+    full = client.get("/climate-zone/boundaries", params={"zoom": 14}, headers={"Accept-Encoding": "gzip"})
+    assert low.headers["content-encoding"] == "gzip"
+    assert low.json()["features"][0]["properties"]["climate"] == "Dunedin"
+    assert len(low.content) < len(full.content)
+    assert low.headers["etag"] != full.headers["etag"]
+
+    identity = client.get("/climate-zone/boundaries", params={"detail": "low"}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.content == low.content
+    assert identity.headers["etag"] != low.headers["etag"]
+
+    cached = client.get("/climate-zone/boundaries", params={"detail": "low"},
+                        headers={"Accept-Encoding": "gzip", "If-None-Match": low.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
@@ -0,0 +1,167 @@
+import os
+import sys
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+fiona = pytest.importorskip("fiona")
+pytest.importorskip("matplotlib")
+import pyproj
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, shape
+from shapely.ops import transform
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "data-analysis", "climate-zone-boundaries"))
+from climate_zone_boundaries import load_and_transform_shapefile
+from ta_to_climate_zone import ta_to_climate_zone
+
+
+def _reference_load(shapefile_path):
+    """The original per-feature, per-vertex fiona/pyproj loader."""
+    def adjust_longitude(x, y):
+        if x < 0:
+            x += 360
+        return x, y
+
+    with fiona.open(shapefile_path, 'r') as shapefile:
+        transformer = pyproj.Transformer.from_crs(shapefile.crs, pyproj.CRS("EPSG:4326"), always_xy=True)
+        rows = []
+        for feature in shapefile:
+            geometry = transform(adjust_longitude, transform(transformer.transform, shape(feature["geometry"])))
+            ta_name = feature['properties'].get('TA2023_V_1', 'Unknown')
+            rows.append((geometry, ta_to_climate_zone.get(ta_name, "Unknown"), ta_name))
+        return rows
+
+
+@pytest.fixture
+def ta_shapefile(tmp_path):
+    square = Polygon([(170, -45), (171, -45), (171, -44), (170, -44)], [[(170.2, -44.8), (170.4, -44.8), (170.4, -44.6)]])
+    islands = MultiPolygon([
+        Polygon([(176, -40), (176.5, -40), (176.5, -39.5)]),
+        Polygon([(-176.8, -44.2), (-176.2, -44.2), (-176.2, -43.7), (-176.8, -43.7)]),
+    ])
+    gdf = gpd.GeoDataFrame(
+        {"TA2023_V_1": ["Waitaki District", "Chatham Islands Territory"]},
+        geometry=[square, islands], crs="EPSG:4326",
+    ).to_crs("EPSG:2193")
+    path = tmp_path / "ta.shp"
+    gdf.to_file(path)
+    return str(path)
+
+
+def test_load_and_transform_shapefile_matches_reference(ta_shapefile):
+    """
+    Test that the vectorised loader gives exactly the same geometries and attributes as the per-vertex path.
+    """
+    gdf = load_and_transform_shapefile(ta_shapefile)
+    reference = _reference_load(ta_shapefile)
+    assert list(gdf.columns) == ['geometry', 'climate', 'ta_name']
+    assert gdf.crs == "EPSG:4326"
+    assert list(gdf['ta_name']) == [ta_name for _, _, ta_name in reference]
+    assert list(gdf['climate']) == [climate for _, climate, _ in reference]
+    for geometry, (expected, _, _) in zip(gdf.geometry, reference):
+        assert shapely.to_wkb(geometry) == shapely.to_wkb(expected)
+    assert gdf.geometry.bounds['minx'].min() >= 0
+
+
+@pytest.fixture
+def pipeline_inputs(tmp_path, monkeypatch):
+    """A tiny TA shapefile and river GeoPackage laid out where the pipeline expects them."""
+    pytest.importorskip("pyarrow")
+    from shapely.geometry import LineString, box
+    import climate_zone_boundaries
+
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.dirname(climate_zone_boundaries.INPUT_SHAPEFILE_PATH))
+    gpd.GeoDataFrame(
+        {"TA2023_V_1": ["Waitaki District", "Rangitikei District", "Dunedin City"]},
+        geometry=[box(170.34, -45, 170.58, -44.7), box(175.5, -40, 175.7, -39.6), box(170.4, -46, 170.6, -45.5)],
+        crs="EPSG:4326",
+    ).to_crs("EPSG:2193").to_file(climate_zone_boundaries.INPUT_SHAPEFILE_PATH)
+
+    def write_river(coords):
+        path = climate_zone_boundaries.process_river.GPKG_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        gpd.GeoDataFrame({"name": ["Otekaieke River"]}, geometry=[LineString(coords)], crs="EPSG:4326").to_file(path)
+
+    write_river([(170.36, -44.89), (170.45, -44.86), (170.56, -44.82)])
+    return write_river
+
+
+def test_pipeline_reruns_only_changed_stages(pipeline_inputs, capsys):
+    """
+    Test that a re-run with unchanged inputs is served from the cache, and that
+    changing the river only reruns the stages downstream of it.
+    """
+    from climate_zone_boundaries import main
+
+    merged = main(plots=False)
+    assert set(merged['climate']) == {'Dunedin', 'Central Otago', 'Manawatu', 'Taupo'}
+    first = capsys.readouterr().out
+    assert "load: running" in first and "export: running" in first
+    assert "plot" not in first
+
+    main(plots=False)
+    second = capsys.readouterr().out
+    assert "running" not in second
+
+    pipeline_inputs([(170.36, -44.88), (170.45, -44.85), (170.56, -44.82)])
+    main(plots=False)
+    third = capsys.readouterr().out
+    assert "load: up to date" in third
+    for stage in ("river", "split", "dissolve", "export"):
+        assert f"{stage}: running" in third
+
+
+def test_apply_split_rules():
+    """
+    Test that every TA in the rules is replaced by its pieces, named and zoned by side of the split line.
+    """
+    from shapely.geometry import LineString, box
+    from climate_zone_boundaries import apply_split_rules
+
+    ta_gdf = gpd.GeoDataFrame(
+        {"climate": ["Manawatu", "Dunedin", "Dunedin"], "ta_name": ["Rangitikei District", "Waitaki District", "Dunedin City"]},
+        geometry=[box(175.5, -40, 175.7, -39.6), box(170.34, -45, 170.58, -44.7), box(170.4, -46, 170.6, -45.5)],
+        crs="EPSG:4326",
+    )
+    split_lines = {
+        "Otekaieke River": LineString([(170.3, -44.9), (170.6, -44.8)]),
+        "Rangitikei Split Line": LineString([(175.4, -39.8), (175.8, -39.8)]),
+    }
+    result = apply_split_rules(ta_gdf, split_lines)
+    names = list(result["ta_name"])
+    assert names[0] == "Dunedin City"
+    assert set(names[1:3]) == {"Waitaki District (Coastal)", "Waitaki District (Inland)"}
+    assert set(names[3:5]) == {"Rangitikei District (Coastal)", "Rangitikei District (Inland)"}
+    zones = dict(zip(result["ta_name"], result["climate"]))
+    assert zones["Waitaki District (Coastal)"] == "Dunedin"
+    assert zones["Waitaki District (Inland)"] == "Central Otago"
+    assert zones["Rangitikei District (Coastal)"] == "Manawatu"
+    assert zones["Rangitikei District (Inland)"] == "Taupo"
+    assert shapely.area(result.geometry.values).sum() == pytest.approx(shapely.area(ta_gdf.geometry.values).sum())
+
+
+def test_plot_geometries_one_patch_per_zone():
+    """
+    Test that each climate zone is drawn as a single patch, holes included, with the legend in first-seen order.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from shapely.geometry import box
+    from climate_zone_boundaries import plot_geometries, polygons_path
+
+    holey = Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (3, 1), (3, 3), (1, 3)]])
+    gdf = gpd.GeoDataFrame(
+        {"climate": ["Taupo", "Dunedin", "Taupo"], "ta_name": ["a", "b", "c"]},
+        geometry=[holey, MultiPolygon([box(5, 0, 6, 1), box(7, 0, 8, 1)]), box(0, 5, 1, 6)],
+    )
+    path = polygons_path(gdf.geometry.values[:1])
+    assert len(path.vertices) == 10
+    assert list(path.codes).count(path.MOVETO) == 2
+    plot_geometries(gdf, {}, "title", simplify_tolerance=0.01)
+    ax = plt.gca()
+    assert len(ax.patches) == 2
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == ["Taupo", "Dunedin"]
+    plt.close()
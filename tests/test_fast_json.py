@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("orjson")
+
+from app import fast_json
+from app.main import app
+
+
+client = TestClient(app)
+
+BATCH = [
+    {"volume_litres": 100, "temp_increase_celsius": 50, "efficiency": 0.8},
+    {"volume_litres": "x", "temp_increase_celsius": 50, "efficiency": 0.8},
+]
+
+
+def _responses():
+    return [
+        client.post("/space-heating/", json={"area": 120.5, "insulation_level": "high", "average_temperature": 20, "heating_type": "gas"}),
+        client.post("/water-heating/", json=BATCH[0]),
+        client.post("/water-heating/batch", json=BATCH),
+        client.post("/space-heating/batch", json=[]),
+    ]
+
+
+def test_fast_json_matches_default(monkeypatch):
+    """
+    Test that the orjson path returns the same responses and OpenAPI schema as the default path.
+    """
+    monkeypatch.setattr(fast_json, "ENABLED", False)
+    expected = [(r.status_code, r.json()) for r in _responses()]
+    schema = client.get("/openapi.json").json()
+    monkeypatch.setattr(fast_json, "ENABLED", True)
+    assert [(r.status_code, r.json()) for r in _responses()] == expected
+    assert client.get("/openapi.json").json() == schema
+
+
+def test_fast_json_invalid_body(monkeypatch):
+    """
+    Test that a malformed body is still reported as a 422 on the orjson path.
+    """
+    monkeypatch.setattr(fast_json, "ENABLED", True)
+    response = client.post("/water-heating/", content=b"{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 422
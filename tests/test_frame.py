@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from app.calculations import (
+    calculate_heating,
+    calculate_heating_frame,
+    calculate_water_heating,
+    calculate_water_heating_frame,
+)
+from app.models import SpaceHeatingModel, WaterHeatingModel
+
+
+SPACE_HEATING_ROWS = {
+    "area": [150, 100.5, 200, 0.1],
+    "insulation_level": ["high", "medium", "low", "low"],
+    "average_temperature": [20, 18, 15, 12.5],
+    "heating_type": ["gas", "electric", "oil", "wood"],
+}
+
+WATER_HEATING_ROWS = {
+    "volume_litres": [100, 180.5, 35, 1e4],
+    "temp_increase_celsius": [50, 42.3, 55, 0.7],
+    "efficiency": [0.8, 3.1, 0.95, 0.333],
+}
+
+
+def _rows(columns):
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def test_heating_frame_matches_scalar():
+    """
+    Test that the columnar space heating calculation matches the per-record one exactly.
+    """
+    result = calculate_heating_frame({k: np.asarray(v) for k, v in SPACE_HEATING_ROWS.items()})
+    expected = [calculate_heating(SpaceHeatingModel(**row))["cost"] for row in _rows(SPACE_HEATING_ROWS)]
+    assert result["cost"].tolist() == expected
+
+
+def test_water_heating_frame_matches_scalar():
+    """
+    Test that the columnar water heating calculation matches the per-record one exactly.
+    """
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(WATER_HEATING_ROWS, index=[10, 11, 12, 13])
+    result = calculate_water_heating_frame(df)
+    expected = [calculate_water_heating(WaterHeatingModel(**row))["energy_required"] for row in _rows(WATER_HEATING_ROWS)]
+    assert list(result.index) == [10, 11, 12, 13]
+    assert result["energy_required"].tolist() == expected
+
+
+def test_frame_validation():
+    """
+    Test that invalid rows raise by default and are flagged when coerced.
+    """
+    data = dict(WATER_HEATING_ROWS, volume_litres=np.array([100, "abc", None, "35"], dtype=object))
+    with pytest.raises(ValueError, match="volume_litres"):
+        calculate_water_heating_frame(data)
+    result = calculate_water_heating_frame(data, errors="coerce")
+    assert result["valid"].tolist() == [True, False, False, True]
+    assert np.isnan(result["energy_required"][1:3]).all()
+    assert result["energy_required"][3] == calculate_water_heating(WaterHeatingModel(**_rows(data)[3]))["energy_required"]
+    with pytest.raises(ValueError, match="heating_type"):
+        calculate_heating_frame({k: v for k, v in SPACE_HEATING_ROWS.items() if k != "heating_type"})
+    with pytest.raises(ZeroDivisionError):
+        calculate_water_heating_frame(dict(WATER_HEATING_ROWS, efficiency=[0.8, 0, 1, 1]))
@@ -35,7 +35,7 @@ def test_calculate_heating():
     """
     test_input = SpaceHeatingModel(area=100, insulation_level="medium", average_temperature=22, heating_type="electric")
     result = calculate_heating(test_input)
-    assert result == {"cost": test_input.area * 5
+    assert result == {"cost": test_input.area * 5}
 
 
 def test_calculate_water_heating():
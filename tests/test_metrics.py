@@ -0,0 +1,46 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.metrics import MetricsMiddleware, metrics_registry
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint():
+    """
+    Test that requests are counted per route template and status, with phase timings.
+    """
+    metrics_registry.clear()
+    payload = {"volume_litres": 100, "temp_increase_celsius": 50, "efficiency": 0.8}
+    client.post("/water-heating/", json=payload)
+    client.post("/water-heating/", json=payload)
+    client.post("/water-heating/", json={"volume_litres": "x"})
+    client.get("/no-such-route")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_requests_total{method="POST",route="/water-heating/",status="200"} 2' in text
+    assert 'http_requests_total{method="POST",route="/water-heating/",status="422"} 1' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'http_request_duration_seconds_count{method="POST",route="/water-heating/"} 3' in text
+    for phase, count in (("validation", 3), ("calculation", 2), ("serialization", 2)):
+        assert f'http_request_phase_duration_seconds_count{{method="POST",route="/water-heating/",phase="{phase}"}} {count}' in text
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/water-heating/",le="+Inf"} 3' in text
+
+
+def test_slow_request_log(caplog, monkeypatch):
+    """
+    Test that requests over the slow request threshold are logged.
+    """
+    client.get("/metrics")  # builds the middleware stack
+    middleware = app.middleware_stack
+    while not isinstance(middleware, MetricsMiddleware):
+        middleware = middleware.app
+    monkeypatch.setattr(middleware, "slow_request_seconds", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        client.post("/space-heating/", json={"area": 1, "insulation_level": "a", "average_temperature": 1, "heating_type": "b"})
+    assert "Slow request: POST /space-heating/ -> 200" in caplog.text
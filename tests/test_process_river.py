@@ -0,0 +1,65 @@
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+nx = pytest.importorskip("networkx")
+pytest.importorskip("geopandas")
+from shapely.geometry import LineString, MultiLineString
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "data-analysis", "climate-zone-boundaries"))
+from process_river import simplified_river_path
+
+
+def _all_pairs_longest(lines):
+    """The original all-pairs Dijkstra search, as a reference."""
+    G = nx.Graph()
+    for line in lines:
+        G.add_edge(line.coords[0], line.coords[-1], weight=line.length)
+    endpoints = [node for node, degree in G.degree() if degree == 1]
+    best = 0
+    for a, b in itertools.combinations(endpoints, 2):
+        try:
+            best = max(best, nx.single_source_dijkstra(G, a, b, weight='weight')[0])
+        except nx.NetworkXNoPath:
+            continue
+    return best
+
+
+def _path_length(path, lines):
+    lengths = {frozenset((line.coords[0], line.coords[-1])): line.length for line in lines}
+    return sum(lengths[frozenset(pair)] for pair in zip(path.coords, path.coords[1:]))
+
+
+def _random_tree(rng, n):
+    points = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+    return [LineString([points[i], points[rng.randrange(i)]]) for i in range(1, n)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_tree_matches_all_pairs(seed):
+    """
+    Test that the two-sweep search finds the same longest path as the all-pairs search on trees.
+    """
+    rng = random.Random(seed)
+    lines = _random_tree(rng, 30) + [LineString([(200 + i, 0), (201 + i, 0)]) for i in range(3)]
+    path = simplified_river_path([MultiLineString(lines)])
+    assert _path_length(path, lines) == pytest.approx(_all_pairs_longest(lines))
+
+
+def test_braided_river():
+    """
+    Test that a braided channel (a cycle) still gives the path between the river's ends.
+    """
+    lines = [
+        LineString([(0, 0), (1, 0)]),
+        LineString([(1, 0), (2, 1), (3, 0)]),
+        LineString([(1, 0), (2, -0.5), (3, 0)]),
+        LineString([(3, 0), (4, 0)]),
+        LineString([(2.5, 3), (3, 0)]),
+    ]
+    path = simplified_river_path(lines)
+    assert {path.coords[0], path.coords[-1]} == {(0, 0), (2.5, 3)}
+    assert _path_length(path, lines) == pytest.approx(_all_pairs_longest(lines))
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from app.calculations import calculate_water_heating_frame
+from scripts.run_heating_analysis import main, run_heating_analysis
+
+
+def _households(n):
+    return pd.DataFrame({
+        "volume_litres": [100.0 + i for i in range(n)],
+        "temp_increase_celsius": [50.0] * n,
+        "efficiency": [0.8 if i % 3 else 2.5 for i in range(n)],
+    })
+
+
+def _read_parts(output_dir):
+    parts = sorted(f for f in os.listdir(output_dir) if f.startswith("part-"))
+    return pd.concat([pd.read_csv(os.path.join(output_dir, f)) for f in parts], ignore_index=True)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_heating_analysis_chunks(tmp_path, workers):
+    """
+    Test that a chunked run over a CSV writes one part per chunk and matches the in-memory calculation.
+    """
+    households = _households(7)
+    input_path = tmp_path / "households.csv"
+    households.to_csv(input_path, index=False)
+    rows = run_heating_analysis(str(input_path), str(tmp_path / "out"), kind="water", chunk_size=3, workers=workers)
+    assert rows == 7
+    assert len(os.listdir(tmp_path / "out")) == 3
+    result = _read_parts(tmp_path / "out")
+    expected = calculate_water_heating_frame(households)
+    assert result["energy_required"].tolist() == pytest.approx(expected["energy_required"].tolist(), rel=1e-15)
+
+
+def test_run_heating_analysis_resume(tmp_path, capsys):
+    """
+    Test that resuming skips chunks that are already finished.
+    """
+    input_path = tmp_path / "households.csv"
+    _households(5).to_csv(input_path, index=False)
+    output_dir = tmp_path / "out"
+    main([str(input_path), str(output_dir), "--kind", "water", "--chunk-size", "2", "--workers", "1"])
+    finished = output_dir / "part-000000.csv"
+    finished.write_text("sentinel\n")
+    os.remove(output_dir / "part-000002.csv")
+    main([str(input_path), str(output_dir), "--kind", "water", "--chunk-size", "2", "--workers", "1", "--resume"])
+    assert "Processed 1 rows" in capsys.readouterr().out.splitlines()[-1]
+    assert finished.read_text() == "sentinel\n"
+    assert (output_dir / "part-000002.csv").exists()
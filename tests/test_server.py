@@ -0,0 +1,38 @@
+import os
+
+from app.server import server_options
+
+
+def test_production_defaults():
+    """
+    Test that production mode runs a worker per CPU without the reloader.
+    """
+    options = server_options([], environ={})
+    assert "reload" not in options
+    assert options["workers"] == (os.cpu_count() or 1)
+    assert options["port"] == 8000
+    assert options["loop"] in ("uvloop", "asyncio")
+    assert options["http"] in ("httptools", "h11")
+
+
+def test_environment_and_flags():
+    """
+    Test that options come from environment variables and that flags override them.
+    """
+    environ = {"WEB_CONCURRENCY": "3", "PORT": "80", "KEEP_ALIVE": "20", "BACKLOG": "512", "GRACEFUL_TIMEOUT": "10"}
+    options = server_options([], environ=environ)
+    assert options["workers"] == 3
+    assert options["port"] == 80
+    assert options["timeout_keep_alive"] == 20
+    assert options["backlog"] == 512
+    assert options["timeout_graceful_shutdown"] == 10
+    assert server_options(["--workers", "5"], environ=environ)["workers"] == 5
+
+
+def test_dev_mode():
+    """
+    Test that dev mode keeps the single auto-reloading process.
+    """
+    for options in (server_options(["--dev"], environ={}), server_options([], environ={"APP_ENV": "dev"})):
+        assert options["reload"] is True
+        assert "workers" not in options
@@ -0,0 +1,57 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.calculations import calculate_heating, calculate_water_heating
+from app.models import SpaceHeatingModel, WaterHeatingModel
+
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _chunks(text, size=7):
+    data = text.encode()
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_water_heating_stream_ndjson():
+    """
+    Test that a streamed NDJSON upload, split mid-line, gets one result line per household in order.
+    """
+    households = [{"volume_litres": 100 + i, "temp_increase_celsius": 50, "efficiency": 0.8} for i in range(5)]
+    lines = [json.dumps(h) for h in households]
+    lines.insert(2, "{not json")
+    response = client.post(
+        "/water-heating/stream", params={"chunk_size": 2},
+        content=_chunks("\n".join(lines) + "\n"), headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["index"] for r in results] == list(range(6))
+    assert results[2]["success"] is False
+    assert results[2]["errors"][0]["type"] == "parse_error"
+    expected = [calculate_water_heating(WaterHeatingModel(**h))["energy_required"] for h in households]
+    assert [r["energy_kwh"] for r in results if r["success"]] == expected
+
+
+def test_space_heating_stream_csv():
+    """
+    Test that a streamed CSV upload is validated and calculated per row.
+    """
+    csv_text = (
+        "area,insulation_level,average_temperature,heating_type\r\n"
+        "150,high,20,gas\r\n"
+        "abc,low,15,oil\r\n"
+        "100,medium,18\r\n"
+        "\"200.5\",\"low, draughty\",15,wood\r\n"
+    )
+    response = client.post("/space-heating/stream", content=_chunks(csv_text), headers={"Content-Type": "text/csv"})
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results[0]["data"] == calculate_heating(SpaceHeatingModel(area=150, insulation_level="high", average_temperature=20, heating_type="gas"))
+    assert results[1]["errors"][0]["loc"] == ["area"]
+    assert results[2]["errors"][0]["type"] == "parse_error"
+    assert results[3]["data"] == {"cost": 200.5 * 5}